@@ -0,0 +1,324 @@
+import math
+
+import numpy as np
+
+import boat_physics
+from boat_physics import (
+    INPUT_DECAY_TIME,
+    PHYSICS_DT,
+    REFERENCE_HZ,
+    ROTATION_SPEED,
+    ROTATION_STEP,
+)
+
+# ================================================================
+# BATCH BOAT SIMULATOR (NumPy, thousands of boats per step)
+# ================================================================
+# Same rules as boat_physics.step, applied to every boat of a batch with
+# array operations: for handling experiments, level difficulty and AI
+# policies at a scale the per-boat pygame.Vector2 loop cannot reach.
+# Nothing here draws or needs a display.
+
+WIDTH, HEIGHT = 1250, 650  # week2.py playfield
+
+# Handling constants a batch can override per boat (defaults: boat_physics)
+HANDLING = (
+    "MAX_SPEED",
+    "BASE_ACCEL",
+    "ACCEL_PER_PRESS",
+    "BASE_FRICTION",
+    "SIDEWAYS_FRICTION",
+    "SIDEWAYS_DRIFT_MULT",
+    "SINGLE_KEY_ACCEL_MULT",
+    "SINGLE_KEY_SIDEWAYS_MULT",
+)
+
+
+def default_handling():
+    return {name: getattr(boat_physics, name) for name in HANDLING}
+
+
+class BoatBatch:
+    """State of ``n`` boats as arrays, one row per boat.
+
+    The fields mirror BoatState and BoatControls: ``pos``/``vel`` are
+    ``(n, 2)``, the rest ``(n,)``. Input methods take a boolean mask of
+    the boats they apply to. ``handling`` overrides HANDLING constants,
+    each with a scalar or one value per boat.
+    """
+
+    def __init__(self, n, pos, angle=0.0, handling=None):
+        self.n = n
+        values = default_handling()
+        values.update(handling or {})
+        self.handling = {
+            name: np.broadcast_to(np.asarray(values[name], dtype=np.float64), (n,))
+            for name in HANDLING
+        }
+        self.pos = np.zeros((n, 2))
+        self.vel = np.zeros((n, 2))
+        self.angle = np.zeros(n)
+        self.rotating = np.zeros(n, dtype=bool)
+        self.rotation_start_angle = np.zeros(n)
+        self.rotation_direction = np.zeros(n)
+        self.target_angle = np.zeros(n)
+        self.left = np.zeros(n, dtype=bool)
+        self.right = np.zeros(n, dtype=bool)
+        self.down = np.zeros(n, dtype=bool)
+        self.buffer = np.zeros(n)
+        self.idle = np.zeros(n)
+        self.fresh = np.zeros(n, dtype=bool)
+        self.reset(pos, angle)
+
+    def _all(self, mask):
+        return np.ones(self.n, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+
+    def reset(self, pos, angle=0.0, mask=None):
+        """Put the masked boats (default: all) back at ``pos``, at rest."""
+        m = self._all(mask)
+        self.pos[m] = pos
+        self.vel[m] = 0
+        self.angle[m] = angle
+        self.rotating[m] = False
+        self.rotation_start_angle[m] = angle
+        self.rotation_direction[m] = 0
+        self.target_angle[m] = angle
+        self.left[m] = False
+        self.right[m] = False
+        self.down[m] = False
+        self.buffer[m] = 0
+        self.idle[m] = 0
+        self.fresh[m] = False
+
+    def start_turn(self, direction, mask=None):
+        """BoatState.start_turn for the masked boats (1 = left, -1 = right)."""
+        m = self._all(mask)
+        new = m & ~self.rotating
+        self.rotation_start_angle[new] = self.angle[new]
+        self.rotation_direction[new] = direction
+        self.target_angle[new] = (self.angle[new] + direction * ROTATION_STEP) % 360
+        self.rotating[new] = True
+        back = m & ~new & (self.rotation_direction == -direction)
+        self.target_angle[back] = self.rotation_start_angle[back] % 360
+        self.rotation_direction[back] = 0
+
+    def press(self, mask=None, strokes=1):
+        """BoatControls.press for the masked boats."""
+        m = self._all(mask)
+        self.buffer[m] += strokes
+        self.idle[m] = 0
+        self.fresh[m] = True
+
+    def paddle(self, key, mask=None):
+        """A key press as the game handles it: "left", "right" or "down".
+
+        Like the game's KEYDOWN handlers, the turn only starts if the key
+        was not already held; the key stays held until ``release``.
+        """
+        m = self._all(mask)
+        held = getattr(self, key)
+        self.start_turn(-1 if key == "right" else 1, m & ~held)
+        held |= m
+        self.press(m, 0 if key == "down" else 1)
+
+    def release(self, key, mask=None):
+        getattr(self, key)[self._all(mask)] = False
+
+    def step(self, dt=PHYSICS_DT, force=None):
+        """One tick of boat_physics.step for every boat; returns the moves.
+
+        ``force`` is an ``(n, 2)`` (or broadcastable) external acceleration.
+        Like ``step``, the caller applies the returned moves to ``pos``.
+        """
+        frames = dt * REFERENCE_HZ
+        h = self.handling
+
+        # Stroke burst decays unless a stroke just landed
+        decay = ~self.fresh
+        self.fresh[:] = False
+        self.idle[decay] += dt
+        expired = decay & (self.idle > INPUT_DECAY_TIME)
+        self.buffer[expired] = 0
+        self.buffer[decay & ~expired] *= math.exp(-dt / INPUT_DECAY_TIME)
+
+        # Smooth rotation towards the target heading
+        r = self.rotating
+        if r.any():
+            diff = (self.target_angle[r] - self.angle[r] + 180) % 360 - 180
+            self.angle[r] += np.copysign(np.minimum(np.abs(diff), ROTATION_SPEED * dt), diff)
+            remaining = (self.target_angle[r] - self.angle[r] + 180) % 360 - 180
+            done = np.flatnonzero(r)[np.abs(remaining) < 0.01]
+            self.angle[done] = self.target_angle[done] % 360
+            self.rotating[done] = False
+            self.rotation_direction[done] = 0
+        self.angle %= 360
+
+        rad = np.radians(self.angle)
+        forward = np.stack((np.sin(rad), -np.cos(rad)), axis=1)
+        single_key = self.left != self.right
+
+        accel = h["BASE_ACCEL"] + h["ACCEL_PER_PRESS"] * self.buffer
+        accel = np.where(single_key, accel * h["SINGLE_KEY_ACCEL_MULT"], accel)
+        accel = np.where(self.buffer > 0.01, accel, 0.0)
+        self.vel += forward * (accel * dt)[:, None]
+
+        if force is not None:
+            self.vel += np.asarray(force) * dt
+
+        max_speed = h["MAX_SPEED"]
+        speed = np.hypot(self.vel[:, 0], self.vel[:, 1])
+        over = speed > max_speed
+        self.vel[over] *= (max_speed[over] / speed[over])[:, None]
+
+        moving = speed > 0.01
+        clamped = np.minimum(speed, max_speed)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            alignment = np.einsum("ij,ij->i", self.vel, forward) / clamped
+        drift = h["SIDEWAYS_DRIFT_MULT"]
+        sideways_effect = np.where(single_key, drift * h["SINGLE_KEY_SIDEWAYS_MULT"], drift)
+        friction = (
+            h["BASE_FRICTION"]
+            + (1 - np.abs(alignment))
+            * (h["SIDEWAYS_FRICTION"] - h["BASE_FRICTION"])
+            * sideways_effect
+        )
+        self.vel[moving] *= (friction[moving] ** frames)[:, None]
+        self.vel[~moving] = 0
+
+        return self.vel * frames
+
+
+class BatchWind:
+    """WindSystem with an independent gust schedule for each boat."""
+
+    def __init__(self, n, rng=None):
+        self.n = n
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.active = np.zeros(n, dtype=bool)
+        self.timer = np.zeros(n)
+        self.next_gust_in = self.rng.uniform(4, 7, n)
+        self.gust_duration = np.ones(n)
+        self.gust_timer = np.zeros(n)
+        self.direction = np.zeros(n)
+        self.strength = np.zeros(n)
+
+    def update(self, dt):
+        a = self.active.copy()
+        self.gust_timer[a] += dt
+        ended = a & (self.gust_timer >= self.gust_duration)
+        k = int(ended.sum())
+        self.active[ended] = False
+        self.next_gust_in[ended] = self.rng.uniform(4, 7, k)
+        self.timer[ended] = 0
+
+        calm = ~a
+        self.timer[calm] += dt
+        start = calm & (self.timer >= self.next_gust_in)
+        k = int(start.sum())
+        self.active[start] = True
+        self.gust_timer[start] = 0
+        self.gust_duration[start] = self.rng.uniform(1.5, 3.0, k)
+        self.direction[start] = self.rng.choice((-1, 1), k)
+        self.strength[start] = self.rng.uniform(0.8, 1.5, k)
+
+    def get_force(self):
+        ease = np.sin(self.gust_timer / self.gust_duration * math.pi)
+        fx = np.where(self.active, self.direction * self.strength * ease, 0.0)
+        return np.stack((fx, np.zeros(self.n)), axis=1)
+
+
+def river_current_force(xs, strength=30, river_left=200, river_right=WIDTH - 200):
+    """RiverCurrent.get_force for an array of boat x positions."""
+    xs = np.asarray(xs, dtype=np.float64)
+    force = np.zeros((len(xs), 2))
+    river_width = river_right - river_left
+    if river_width <= 0:
+        return force
+    center = (river_left + river_right) / 2
+    dist_from_center = np.minimum(np.abs(xs - center) / (river_width / 2), 1.0)
+    force[:, 1] = strength * (1.0 - 0.7 * dist_from_center)
+    return force
+
+
+def simulate(batch, ticks, policy=None, wind=None, current=None, field=None,
+             radius=15, bounds=(WIDTH, HEIGHT), finish_y=None, dt=PHYSICS_DT, flow=None):
+    """Run ``batch`` for ``ticks`` fixed ticks and report what happened.
+
+    ``policy(batch, tick, alive)`` sets the inputs for the tick (use the
+    batch's ``paddle``/``release`` with ``alive`` as the mask). ``wind``
+    (a BatchWind) pushes the boats; the river carries them at ``current``
+    px/s along the FlowField ``flow``, or without one along
+    ``river_current_force``. With a DistanceField ``field``, a boat whose
+    circle of ``radius`` touches an obstacle crashes and stops. Positions
+    are clamped to ``bounds`` like level 2. A boat reaching
+    ``y < finish_y`` finishes and stops.
+
+    Returns a dict of per-boat arrays: ``crash_tick`` and ``finish_tick``
+    (-1 if it never happened) and the final ``pos``.
+    """
+    n = batch.n
+    crash_tick = np.full(n, -1)
+    finish_tick = np.full(n, -1)
+    alive = np.ones(n, dtype=bool)
+    w, h = bounds
+    for tick in range(ticks):
+        if not alive.any():
+            break
+        if policy is not None:
+            policy(batch, tick, alive)
+        force = None
+        if wind is not None:
+            wind.update(dt)
+            force = wind.get_force()
+        move = batch.step(dt, force)
+        if current is not None and flow is not None:
+            move += flow.sample_many(batch.pos[:, 0], batch.pos[:, 1]) * (current * dt)
+        elif current is not None:
+            move += river_current_force(batch.pos[:, 0], current) * dt
+        batch.pos[alive] += move[alive]
+        batch.pos[:, 0] = np.clip(batch.pos[:, 0], radius, w - radius)
+        batch.pos[:, 1] = np.clip(batch.pos[:, 1], 0, h)
+
+        if field is not None:
+            hit = alive & (field.distances(batch.pos[:, 0], batch.pos[:, 1]) <= radius)
+            crash_tick[hit] = tick
+            alive &= ~hit
+        if finish_y is not None:
+            done = alive & (batch.pos[:, 1] < finish_y)
+            finish_tick[done] = tick
+            alive &= ~done
+        batch.vel[~alive] = 0
+    return {"crash_tick": crash_tick, "finish_tick": finish_tick, "pos": batch.pos.copy()}
+
+
+if __name__ == "__main__":
+    import time
+
+    from collision import DistanceField
+
+    # Level 2 with random paddling: how many boats make it, how many crash
+    level2_cubes = [  # as in week2.py
+        (0, 0, 150, HEIGHT), (WIDTH - 150, 0, 150, HEIGHT),
+        (150, 500, 220, 80), (680, 520, 260, 100), (320, 340, 200, 75),
+        (580, 220, 240, 70), (820, 350, 180, 85), (250, 130, 180, 65),
+        (500, 0, 350, 80),
+    ]
+    field = DistanceField.from_rects(level2_cubes, WIDTH, HEIGHT, cell=5)
+    rng = np.random.default_rng(1)
+    n = 5000
+    boats = BoatBatch(n, (WIDTH // 2, 600))
+    keys = ("left", "right", "down")
+
+    def random_paddler(batch, tick, alive):
+        for key in keys:
+            batch.release(key, alive)
+        if tick % 8 == 0:
+            choice = rng.integers(0, 4, batch.n)
+            for i, key in enumerate(keys):
+                batch.paddle(key, alive & (choice == i))
+
+    start = time.perf_counter()
+    result = simulate(boats, 45 * 60, random_paddler, BatchWind(n, rng), field=field, finish_y=40)
+    secs = time.perf_counter() - start
+    print(f"{n} boats x {45 * 60} ticks in {secs:.2f}s")
+    print(f"finished {int((result['finish_tick'] >= 0).sum())}, crashed {int((result['crash_tick'] >= 0).sum())}")
@@ -0,0 +1,189 @@
+import math
+
+import pygame
+
+# ================================================================
+# BOAT PHYSICS (fixed timestep, shared by every level)
+# ================================================================
+# The handling constants were tuned per frame at 60 FPS. The simulation
+# runs in fixed PHYSICS_DT ticks and scales the per-frame terms (friction,
+# integration) by ``dt * REFERENCE_HZ``, so the boat handles the same
+# whatever the frame rate; at PHYSICS_HZ = 60 a tick is exactly the old
+# frame update.
+REFERENCE_HZ = 60
+PHYSICS_HZ = 60
+PHYSICS_DT = 1 / PHYSICS_HZ
+MAX_STEPS_PER_FRAME = 8  # drop the backlog after a long stall
+
+# Handling constants
+MAX_SPEED = 10  # px per reference frame
+ROTATION_SPEED = 450  # degrees per second
+ROTATION_STEP = 25  # degrees per paddle stroke
+BASE_ACCEL = 0.6
+ACCEL_PER_PRESS = 0.35
+BASE_FRICTION = 0.99
+SIDEWAYS_FRICTION = 0.985
+SIDEWAYS_DRIFT_MULT = 0.75
+SINGLE_KEY_ACCEL_MULT = 0.8
+SINGLE_KEY_SIDEWAYS_MULT = 0.55
+INPUT_DECAY_TIME = 0.25  # seconds
+
+
+class BoatState:
+    """Position, velocity and heading of a boat, plus its turn in progress."""
+
+    def __init__(self, pos, angle=0):
+        self.reset(pos, angle)
+
+    def reset(self, pos, angle=0):
+        self.pos = pygame.Vector2(pos)
+        self.vel = pygame.Vector2(0, 0)
+        self.angle = angle
+        self.rotating = False
+        self.rotation_start_angle = angle
+        self.rotation_direction = 0
+        self.target_angle = angle
+        # Pose at the previous tick, for render interpolation
+        self.prev_pos = self.pos.copy()
+        self.prev_angle = angle
+
+    def start_turn(self, direction):
+        """Start a ROTATION_STEP turn (1 = left, -1 = right).
+
+        Turning against a turn in progress sends the boat back to the
+        heading that turn started from.
+        """
+        if not self.rotating:
+            self.rotation_start_angle = self.angle
+            self.rotation_direction = direction
+            self.target_angle = (self.rotation_start_angle + direction * ROTATION_STEP) % 360
+            self.rotating = True
+        elif self.rotation_direction == -direction:
+            self.target_angle = self.rotation_start_angle % 360
+            self.rotation_direction = 0
+
+    def interpolated(self, alpha):
+        """``(pos, angle)`` between the last two ticks, for drawing."""
+        pos = self.prev_pos.lerp(self.pos, alpha)
+        diff = (self.angle - self.prev_angle + 180) % 360 - 180
+        return pos, (self.prev_angle + diff * alpha) % 360
+
+
+class BoatControls:
+    """Paddle input: keys held and the decaying burst of recent strokes."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.left = False
+        self.right = False
+        self.down = False
+        self.buffer = 0
+        self.idle = 0.0  # seconds since the last stroke
+        self.fresh = False  # stroke since the last tick (skips one decay)
+
+    def press(self, strokes=1):
+        self.buffer += strokes
+        self.idle = 0.0
+        self.fresh = True
+
+
+def step(state, controls, dt, force=None):
+    """Advance a boat's turn and velocity by one tick of ``dt`` seconds.
+
+    ``force`` is an external acceleration (wind, current) in the paddle's
+    units. Returns this tick's move; the caller applies it to ``state.pos``
+    (through collision).
+    """
+    frames = dt * REFERENCE_HZ
+    state.prev_pos = state.pos.copy()
+    state.prev_angle = state.angle
+
+    # Stroke burst decays unless a stroke just landed
+    if controls.fresh:
+        controls.fresh = False
+    else:
+        controls.idle += dt
+        if controls.idle > INPUT_DECAY_TIME:
+            controls.buffer = 0
+        else:
+            controls.buffer *= math.exp(-dt / INPUT_DECAY_TIME)
+
+    # Smooth rotation towards the target heading
+    if state.rotating:
+        diff = (state.target_angle - state.angle + 180) % 360 - 180
+        max_step = ROTATION_SPEED * dt
+        state.angle += math.copysign(min(abs(diff), max_step), diff)
+        remaining = (state.target_angle - state.angle + 180) % 360 - 180
+        if abs(remaining) < 0.01:
+            state.angle = state.target_angle % 360
+            state.rotating = False
+            state.rotation_direction = 0
+    state.angle %= 360
+
+    forward = pygame.Vector2(0, -1).rotate(state.angle)
+    single_key = controls.left != controls.right
+
+    if controls.buffer > 0.01:
+        accel = BASE_ACCEL + ACCEL_PER_PRESS * controls.buffer
+        if single_key:
+            accel *= SINGLE_KEY_ACCEL_MULT
+        state.vel += forward * accel * dt
+
+    if force is not None:
+        state.vel += force * dt
+
+    speed = state.vel.length()
+    if speed > MAX_SPEED:
+        state.vel = (state.vel / speed) * MAX_SPEED
+
+    if speed > 0.01:
+        alignment = state.vel.normalize().dot(forward)
+        sideways_effect = SIDEWAYS_DRIFT_MULT
+        if single_key:
+            sideways_effect *= SINGLE_KEY_SIDEWAYS_MULT
+        friction = (
+            BASE_FRICTION
+            + (1 - abs(alignment))
+            * (SIDEWAYS_FRICTION - BASE_FRICTION)
+            * sideways_effect
+        )
+        state.vel *= friction ** frames
+    else:
+        state.vel = pygame.Vector2(0, 0)
+
+    return state.vel * frames
+
+
+class FixedTimestep:
+    """Turns variable frame times into whole fixed-size physics ticks.
+
+    Leftover time carries over to the next frame, and ``alpha`` says how
+    far the frame is between the last two ticks (for interpolation).
+    """
+
+    def __init__(self, dt=PHYSICS_DT, max_steps=MAX_STEPS_PER_FRAME):
+        self.dt = dt
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def reset(self):
+        self.accumulator = 0.0
+
+    def ticks(self, frame_dt):
+        """Number of ticks to run for a frame of ``frame_dt`` seconds."""
+        self.accumulator += frame_dt
+        count = 0
+        # The epsilon keeps float drift from splitting a frame of exactly
+        # one tick into zero ticks now and two next frame
+        while self.accumulator >= self.dt - 1e-9 and count < self.max_steps:
+            self.accumulator -= self.dt
+            count += 1
+        if count == self.max_steps:
+            self.accumulator = min(self.accumulator, self.dt * 0.999)
+        return count
+
+    @property
+    def alpha(self):
+        return min(1.0, max(0.0, self.accumulator / self.dt))
@@ -0,0 +1,455 @@
+import math
+from array import array
+
+import pygame
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# ================================================================
+# COLLISION HELPERS (shared by the game scripts)
+# ================================================================
+
+
+def circle_rect_collision(cx, cy, r, rect: pygame.Rect) -> bool:
+    closest_x = max(rect.left, min(cx, rect.right))
+    closest_y = max(rect.top,  min(cy, rect.bottom))
+    dx = cx - closest_x
+    dy = cy - closest_y
+    return (dx * dx + dy * dy) <= (r * r)
+
+
+class OccupancyGrid:
+    """One byte per map tile, 1 where the tile blocks the boat.
+
+    A circle query only looks at the tiles under the circle's bounding box,
+    so its cost depends on the circle size, not on the map size.
+    """
+
+    def __init__(self, cols, rows, tile_w, tile_h):
+        self.cols = cols
+        self.rows = rows
+        self.tile_w = tile_w
+        self.tile_h = tile_h
+        self.cells = bytearray(cols * rows)
+
+    def set_solid(self, tx, ty, solid=True):
+        self.cells[ty * self.cols + tx] = 1 if solid else 0
+
+    def is_solid(self, tx, ty) -> bool:
+        return self.cells[ty * self.cols + tx] != 0
+
+    def solid_count(self) -> int:
+        return self.cols * self.rows - self.cells.count(0)
+
+    def merged_rects(self):
+        """Cover the solid tiles with few maximal rectangles (in pixels).
+
+        Greedy: from each uncovered solid tile (row-major), grow a run to
+        the right, then grow it downwards while the whole run stays solid
+        and uncovered. Every solid tile ends up in exactly one rectangle.
+        """
+        covered = bytearray(len(self.cells))
+        cells = self.cells
+        cols = self.cols
+        rects = []
+        for ty in range(self.rows):
+            row = ty * cols
+            tx = 0
+            while tx < cols:
+                i = row + tx
+                if not cells[i] or covered[i]:
+                    tx += 1
+                    continue
+                end = tx + 1
+                while end < cols and cells[row + end] and not covered[row + end]:
+                    end += 1
+                bottom = ty + 1
+                while bottom < self.rows:
+                    below = bottom * cols
+                    if not all(cells[below + x] and not covered[below + x] for x in range(tx, end)):
+                        break
+                    bottom += 1
+                for y in range(ty, bottom):
+                    covered[y * cols + tx:y * cols + end] = b"\x01" * (end - tx)
+                rects.append(pygame.Rect(
+                    tx * self.tile_w, ty * self.tile_h,
+                    (end - tx) * self.tile_w, (bottom - ty) * self.tile_h,
+                ))
+                tx = end
+        return rects
+
+    def tile_range(self, cx, cy, r):
+        """Tile columns and rows a circle can touch (edges included)."""
+        # Tile rects are closed on the right/bottom edge in circle_rect_collision,
+        # so a tile whose edge is exactly at the circle's bound still counts
+        tx0 = max(0, math.ceil((cx - r) / self.tile_w) - 1)
+        ty0 = max(0, math.ceil((cy - r) / self.tile_h) - 1)
+        tx1 = min(self.cols - 1, math.floor((cx + r) / self.tile_w))
+        ty1 = min(self.rows - 1, math.floor((cy + r) / self.tile_h))
+        return range(tx0, tx1 + 1), range(ty0, ty1 + 1)
+
+    def circle_hits(self, cx, cy, r) -> bool:
+        """True if the circle touches any solid tile."""
+        cols, rows = self.tile_range(cx, cy, r)
+        r2 = r * r
+        for ty in rows:
+            row = ty * self.cols
+            top = ty * self.tile_h
+            closest_y = max(top, min(cy, top + self.tile_h))
+            dy2 = (cy - closest_y) ** 2
+            if dy2 > r2:
+                continue
+            for tx in cols:
+                if self.cells[row + tx]:
+                    left = tx * self.tile_w
+                    closest_x = max(left, min(cx, left + self.tile_w))
+                    if (cx - closest_x) ** 2 + dy2 <= r2:
+                        return True
+        return False
+
+
+def sweep_box(x, y, dx, dy, r, rect):
+    """Sweep a box of half-size ``r`` from (x, y) by (dx, dy) against ``rect``.
+
+    The box hits once it overlaps the rect (touching edges do not count).
+    Returns ``(t, (nx, ny))`` with the time of impact in [0, 1) and the
+    contact normal, or None. A box already overlapping hits at t = 0.
+    """
+    rx, ry, rw, rh = rect
+    t_enter, t_exit = -math.inf, math.inf
+    normal = (0, 0)
+    for p, d, lo, hi, axis in ((x, dx, rx - r, rx + rw + r, 0), (y, dy, ry - r, ry + rh + r, 1)):
+        if d == 0:
+            if not lo < p < hi:
+                return None
+            continue
+        t0, t1 = (lo - p) / d, (hi - p) / d
+        if t0 > t1:
+            t0, t1 = t1, t0
+        if t0 > t_enter:
+            t_enter = t0
+            normal = (-1 if d > 0 else 1, 0) if axis == 0 else (0, -1 if d > 0 else 1)
+        t_exit = min(t_exit, t1)
+    if t_enter >= t_exit or t_enter >= 1 or t_exit <= 0:
+        return None
+    return max(t_enter, 0.0), normal
+
+
+class UniformGrid:
+    """Uniform-grid broadphase over axis-aligned obstacles ``(x, y, w, h)``.
+
+    Each obstacle is registered in every ``cell``-sized cell it overlaps,
+    so a query only checks the obstacles sharing a cell with it. Results
+    come back in the obstacles' original order.
+    """
+
+    def __init__(self, rects, cell=64):
+        self.rects = [tuple(r) for r in rects]
+        self.cell = cell
+        self.cells = {}
+        for i, (x, y, w, h) in enumerate(self.rects):
+            for row in range(y // cell, (y + h - 1) // cell + 1):
+                for col in range(x // cell, (x + w - 1) // cell + 1):
+                    self.cells.setdefault((col, row), []).append(i)
+
+    def _candidates(self, x0, y0, x1, y1):
+        cell = self.cell
+        found = set()
+        for row in range(math.floor(y0 / cell), math.floor(y1 / cell) + 1):
+            for col in range(math.floor(x0 / cell), math.floor(x1 / cell) + 1):
+                found.update(self.cells.get((col, row), ()))
+        return sorted(found)
+
+    def query_rect(self, x, y, w, h):
+        """Obstacles overlapping the rect (touching edges do not count)."""
+        hits = []
+        for i in self._candidates(x, y, x + w, y + h):
+            rx, ry, rw, rh = self.rects[i]
+            if x < rx + rw and x + w > rx and y < ry + rh and y + h > ry:
+                hits.append(self.rects[i])
+        return hits
+
+    def query_circle(self, cx, cy, r):
+        """Obstacles overlapping the circle's bounding box (the boats' hit test)."""
+        return self.query_rect(cx - r, cy - r, 2 * r, 2 * r)
+
+    def sweep_circle(self, x, y, dx, dy, r):
+        """First obstacle hit by the circle moving from (x, y) by (dx, dy).
+
+        Uses the circle's bounding box like ``query_circle``, so a sweep hits
+        exactly when some position along the move would overlap. Returns
+        ``(t, (nx, ny), rect)`` with the time of impact ``t`` in [0, 1) and
+        the contact normal pointing out of the obstacle, or None.
+        """
+        x0, x1 = min(x, x + dx) - r, max(x, x + dx) + r
+        y0, y1 = min(y, y + dy) - r, max(y, y + dy) + r
+        best = None
+        for i in self._candidates(x0, y0, x1, y1):
+            hit = sweep_box(x, y, dx, dy, r, self.rects[i])
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = (hit[0], hit[1], self.rects[i])
+        return best
+
+    def query_point(self, x, y):
+        """Obstacles containing the point (left/top edges inclusive)."""
+        hits = []
+        for i in self.cells.get((math.floor(x / self.cell), math.floor(y / self.cell)), ()):
+            rx, ry, rw, rh = self.rects[i]
+            if rx <= x < rx + rw and ry <= y < ry + rh:
+                hits.append(self.rects[i])
+        return hits
+
+
+class DistanceField:
+    """Signed distance to the nearest obstacle, sampled every ``cell`` px.
+
+    Samples sit at ``(i * cell, j * cell)`` and cover ``w`` x ``h``.
+    Values are positive outside the obstacles, zero on their edges and
+    negative inside (the depth into the deepest containing rect), clamped
+    to +/- ``max_dist``. Lookups interpolate bilinearly between samples.
+    """
+
+    def __init__(self, w, h, cell, max_dist, values=None):
+        self.w = w
+        self.h = h
+        self.cell = cell
+        self.max_dist = max_dist
+        self.cols = math.ceil(w / cell) + 1
+        self.rows = math.ceil(h / cell) + 1
+        if values is None:
+            values = array("f", [max_dist]) * (self.cols * self.rows)
+        self.values = values
+
+    @classmethod
+    def from_rects(cls, rects, w, h, cell=5, max_dist=128):
+        field = cls(w, h, cell, max_dist)
+        if NUMPY_AVAILABLE:
+            field._fill_numpy(rects)
+        else:
+            field._fill_python(rects)
+        return field
+
+    def _window(self, x, y, rw, rh):
+        """Sample columns and rows within max_dist of a rect."""
+        cell = self.cell
+        c0 = max(0, math.floor((x - self.max_dist) / cell))
+        r0 = max(0, math.floor((y - self.max_dist) / cell))
+        c1 = min(self.cols, math.ceil((x + rw + self.max_dist) / cell) + 1)
+        r1 = min(self.rows, math.ceil((y + rh + self.max_dist) / cell) + 1)
+        return c0, r0, c1, r1
+
+    def _fill_numpy(self, rects):
+        grid = np.frombuffer(self.values, dtype=np.float32).reshape(self.rows, self.cols).copy()
+        for x, y, rw, rh in rects:
+            c0, r0, c1, r1 = self._window(x, y, rw, rh)
+            if c0 >= c1 or r0 >= r1:
+                continue
+            px = (np.arange(c0, c1, dtype=np.float32) * self.cell)[None, :]
+            py = (np.arange(r0, r1, dtype=np.float32) * self.cell)[:, None]
+            dx = np.maximum(np.maximum(x - px, px - (x + rw)), 0)
+            dy = np.maximum(np.maximum(y - py, py - (y + rh)), 0)
+            depth = np.minimum(np.minimum(px - x, x + rw - px), np.minimum(py - y, y + rh - py))
+            dist = np.where(depth > 0, -depth, np.hypot(dx, dy))
+            np.minimum(grid[r0:r1, c0:c1], dist, out=grid[r0:r1, c0:c1])
+        np.maximum(grid, -self.max_dist, out=grid)
+        self.values = array("f", grid.astype(np.float32).tobytes())
+
+    def _fill_python(self, rects):
+        values = self.values
+        cell = self.cell
+        for x, y, rw, rh in rects:
+            c0, r0, c1, r1 = self._window(x, y, rw, rh)
+            for row in range(r0, r1):
+                py = row * cell
+                dy = max(y - py, py - (y + rh), 0)
+                depth_y = min(py - y, y + rh - py)
+                base = row * self.cols
+                for col in range(c0, c1):
+                    px = col * cell
+                    depth = min(px - x, x + rw - px, depth_y)
+                    if depth > 0:
+                        dist = -min(depth, self.max_dist)
+                    else:
+                        dist = math.hypot(max(x - px, px - (x + rw), 0), dy)
+                    if dist < values[base + col]:
+                        values[base + col] = dist
+
+    def _cell_at(self, x, y):
+        """Top-left sample index and the fractions across its cell."""
+        fx = min(max(x / self.cell, 0), self.cols - 1.000001)
+        fy = min(max(y / self.cell, 0), self.rows - 1.000001)
+        col = int(fx)
+        row = int(fy)
+        return row * self.cols + col, fx - col, fy - row
+
+    def distance(self, x, y) -> float:
+        """Signed distance at (x, y), clamped to the sampled area."""
+        i, tx, ty = self._cell_at(x, y)
+        v = self.values
+        top = v[i] + (v[i + 1] - v[i]) * tx
+        bottom = v[i + self.cols] + (v[i + self.cols + 1] - v[i + self.cols]) * tx
+        return top + (bottom - top) * ty
+
+    def gradient(self, x, y):
+        """Gradient of the interpolated distance (points away from obstacles)."""
+        i, tx, ty = self._cell_at(x, y)
+        v = self.values
+        c = self.cols
+        gx = ((v[i + 1] - v[i]) * (1 - ty) + (v[i + c + 1] - v[i + c]) * ty) / self.cell
+        gy = ((v[i + c] - v[i]) * (1 - tx) + (v[i + c + 1] - v[i + 1]) * tx) / self.cell
+        return gx, gy
+
+    def distances(self, xs, ys):
+        """``distance`` for arrays of points at once (needs NumPy)."""
+        v = np.frombuffer(self.values, dtype=np.float32)
+        fx = np.clip(np.asarray(xs, dtype=np.float64) / self.cell, 0, self.cols - 1.000001)
+        fy = np.clip(np.asarray(ys, dtype=np.float64) / self.cell, 0, self.rows - 1.000001)
+        col = fx.astype(np.intp)
+        row = fy.astype(np.intp)
+        tx = fx - col
+        ty = fy - row
+        i = row * self.cols + col
+        # Corner samples as float64, like the Python floats in ``distance``
+        a, b = v[i].astype(np.float64), v[i + 1].astype(np.float64)
+        c, d = v[i + self.cols].astype(np.float64), v[i + self.cols + 1].astype(np.float64)
+        top = a + (b - a) * tx
+        bottom = c + (d - c) * tx
+        return top + (bottom - top) * ty
+
+    def circle_hits(self, cx, cy, r) -> bool:
+        return self.distance(cx, cy) <= r
+
+    def to_bytes(self) -> bytes:
+        return self.values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, w, h, cell, max_dist):
+        """Rebuild a field saved with ``to_bytes`` (None if the size is off)."""
+        field = cls(w, h, cell, max_dist)
+        values = array("f")
+        values.frombytes(data)
+        if len(values) != len(field.values):
+            return None
+        field.values = values
+        return field
+
+
+class MaskCollider:
+    """Pixel-accurate hull collision against a level's visible obstacles.
+
+    The obstacle mask comes from the alpha of the level's layers (forest
+    canopies and rocks included). The level's UniformGrid is the
+    broadphase: canopies and rocks overhang their cubes, so its queries
+    reach ``margin`` px further, enough to take in every obstacle pixel,
+    and masks are only overlapped near a cube. Hull masks are drawn once
+    per ``angle_step`` degrees. ``staged`` builds the same collider a
+    layer at a time.
+    """
+
+    def __init__(self, layers, hull, grid, angle_step=5, alpha_threshold=127):
+        for _ in self._build(layers, hull, grid, angle_step, alpha_threshold):
+            pass
+
+    @classmethod
+    def staged(cls, layers, hull, grid, angle_step=5, alpha_threshold=127):
+        """Generator building the collider, yielding after each step; returns it."""
+        collider = cls.__new__(cls)
+        yield from collider._build(layers, hull, grid, angle_step, alpha_threshold)
+        return collider
+
+    def _build(self, layers, hull, grid, angle_step, alpha_threshold):
+        w, h = layers[0].get_size()
+        self.obstacles = pygame.mask.Mask((w, h))
+        for layer in layers:
+            self.obstacles.draw(pygame.mask.from_surface(layer, alpha_threshold), (0, 0))
+            yield
+
+        # Grow the cubes 4 px at a time until they cover every obstacle pixel
+        self.grid = grid
+        self.margin = 0
+        uncovered = self.obstacles.copy()
+        while self.margin < max(w, h):
+            m = self.margin
+            for x, y, rw, rh in grid.rects:
+                uncovered.erase(pygame.mask.Mask((rw + 2 * m, rh + 2 * m), fill=True), (x - m, y - m))
+            if not uncovered.count():
+                break
+            self.margin += 4
+
+        self.hull = [pygame.Vector2(p) for p in hull]
+        self.radius = max(p.length() for p in self.hull)
+        # Farthest a hull pixel reaches past a cube's edge (the hull is
+        # rasterized around a rounded center) plus the overhang
+        self.reach = self.radius + 2 + self.margin
+        self.angle_step = angle_step
+        self._hull_masks = {}
+
+    def hull_mask(self, angle):
+        """``(mask, offset)`` of the hull at ``angle``, offset from its center."""
+        key = round(angle / self.angle_step) * self.angle_step % 360
+        if key not in self._hull_masks:
+            size = int(self.radius * 2) + 3
+            center = size // 2
+            surf = pygame.Surface((size, size), pygame.SRCALPHA)
+            points = [(center + q.x, center + q.y) for q in (p.rotate(key) for p in self.hull)]
+            pygame.draw.polygon(surf, (255, 255, 255), points)
+            self._hull_masks[key] = (pygame.mask.from_surface(surf), -center)
+        return self._hull_masks[key]
+
+    def hits(self, x, y, angle) -> bool:
+        if not self.grid.query_circle(x, y, self.reach):
+            return False
+        mask, offset = self.hull_mask(angle)
+        return self.obstacles.overlap(mask, (round(x) + offset, round(y) + offset)) is not None
+
+    def sweep(self, x, y, dx, dy, angle, step=4):
+        """Sweep the hull from (x, y) by (dx, dy).
+
+        The grid's swept-circle test skips the part of the move that stays
+        clear of every cube; from there the hull is checked every ``step``
+        px so thin obstacles are not skipped, and the first hit is bisected
+        to within half a pixel. Returns ``(t, (nx, ny))`` with the last free
+        fraction of the move and the contact normal pointing out of the
+        obstacle, or None if nothing is hit.
+        """
+        broad = self.grid.sweep_circle(x, y, dx, dy, self.reach)
+        if broad is None:
+            return None
+        length = math.hypot(dx, dy)
+        t0 = broad[0]
+        steps = max(1, math.ceil(length * (1 - t0) / step))
+        free = 0.0
+        for k in range(steps + 1):
+            t = t0 + (1 - t0) * k / steps
+            if not self.hits(x + dx * t, y + dy * t, angle):
+                free = t
+                continue
+            while (t - free) * length > 0.5:
+                mid = (free + t) / 2
+                if self.hits(x + dx * mid, y + dy * mid, angle):
+                    t = mid
+                else:
+                    free = mid
+            return free, self._normal(x + dx * t, y + dy * t, angle, broad[1])
+        return None
+
+    def _normal(self, x, y, angle, fallback):
+        """Unit normal out of the obstacles at a hull pose that touches them.
+
+        Points the way a one-pixel shift of the hull overlaps fewer obstacle
+        pixels; ``fallback`` is used when no shift makes a difference.
+        """
+        mask, offset = self.hull_mask(angle)
+        px, py = round(x) + offset, round(y) + offset
+        area = self.obstacles.overlap_area
+        nx = area(mask, (px - 1, py)) - area(mask, (px + 1, py))
+        ny = area(mask, (px, py - 1)) - area(mask, (px, py + 1))
+        norm = math.hypot(nx, ny)
+        if norm == 0:
+            return fallback
+        return nx / norm, ny / norm
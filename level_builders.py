@@ -0,0 +1,597 @@
+import concurrent.futures
+import importlib
+import inspect
+import math
+import os
+import pickle
+import random
+import subprocess
+import sys
+import threading
+
+import pygame
+
+import level_cache
+
+# ================================================================
+# LEVEL LAYER BUILDERS
+# ================================================================
+# Forest and rock layers are deterministic and can take a while to build,
+# so they live here rather than in the game scripts: worker processes can
+# import this module without opening a window or starting a game loop.
+
+ASSET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "images")
+
+# Source files of the forest layers (part of their disk cache key)
+FOREST_ASSET_PATHS = [
+    os.path.join(ASSET_PATH, "obstacles", name)
+    for name in ("forest_tile.png", "forest1-removebg-preview.png", "forest2-removebg-preview.png")
+]
+
+_forest_assets = None
+
+
+def forest_assets(report_missing=True):
+    """Return ``(floor_tile, canopy1, canopy2)``, loaded once per process.
+
+    Missing or broken files come back as None, like the game's load_image.
+    """
+    global _forest_assets
+    if _forest_assets is None:
+        loaded = []
+        for path in FOREST_ASSET_PATHS:
+            img = None
+            if not os.path.exists(path):
+                if report_missing:
+                    print(f"Asset not found: {path}")
+            else:
+                try:
+                    img = pygame.image.load(path)
+                    # Worker processes have no display to convert for
+                    if pygame.display.get_surface() is not None:
+                        img = img.convert_alpha()
+                except Exception as e:
+                    print(f"Error loading {path}: {e}")
+            loaded.append(img)
+        _forest_assets = tuple(loaded)
+    return _forest_assets
+
+
+# ================================================================
+# FOREST RENDERING - Pre-rendered with real tree canopy assets
+# ================================================================
+class CanopyAtlas:
+    """Scaled and rotated canopy sprites, with their shadows, shared by trees.
+
+    Tree sizes and the small tilt off a quarter turn are snapped to buckets,
+    so the expensive scale + free rotation runs once per (image, size, tilt)
+    bucket; the quarter turn itself is an exact 90-degree rotation.
+    """
+
+    SIZE_STEP = 5
+    TILT_STEP = 10
+
+    def __init__(self, size_step=SIZE_STEP, tilt_step=TILT_STEP):
+        self.size_step = size_step
+        self.tilt_step = tilt_step
+        self._tilted = {}
+        self._variants = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, canopy, size, rot):
+        """Return ``(sprite, shadow)`` for ``canopy`` at ``size`` and ``rot``."""
+        quarter = round(rot / 90)
+        tilt = rot - quarter * 90
+        size_b = max(1, round(size / self.size_step) * self.size_step)
+        tilt_b = round(tilt / self.tilt_step) * self.tilt_step
+        key = (canopy, size_b, tilt_b, quarter % 4)
+
+        variant = self._variants.get(key)
+        if variant is not None:
+            self.hits += 1
+            return variant
+        self.misses += 1
+
+        tilted = self._tilted.get(key[:3])
+        if tilted is None:
+            scaled = pygame.transform.scale(canopy, (size_b, size_b))
+            tilted = pygame.transform.rotate(scaled, tilt_b)
+            self._tilted[key[:3]] = tilted
+        sprite = pygame.transform.rotate(tilted, (quarter % 4) * 90)
+
+        # Shadow (dark version, drawn offset under the canopy)
+        shadow = sprite.copy()
+        shadow.fill((0, 0, 0, 55), special_flags=pygame.BLEND_RGBA_MULT)
+
+        variant = self._variants[key] = (sprite, shadow)
+        return variant
+
+    def stats(self):
+        """``(hits, misses, scale+rotate transforms)`` so far."""
+        return self.hits, self.misses, len(self._tilted)
+
+    @staticmethod
+    def format_report(hits, misses, transforms):
+        total = hits + misses
+        rate = hits / total * 100 if total else 0
+        return (
+            f"Canopy atlas: {hits} hits, {misses} misses ({rate:.0f}% hit rate), "
+            f"{transforms} scale+rotate transforms"
+        )
+
+    def report(self):
+        return self.format_report(*self.stats())
+
+
+def create_forest_surface(cubes, w, h, floor_tile, canopy1, canopy2, cap_trees=False, seed=42,
+                          atlas=None):
+    """Pre-render forest with floor texture and top-down tree canopy assets."""
+    surface = pygame.Surface((w, h), pygame.SRCALPHA)
+    if atlas is None:
+        atlas = CanopyAtlas()
+
+    rng = random.Random(seed)
+
+    for cx, cy, cw, ch in cubes:
+        # ---- Forest floor ----
+        if floor_tile:
+            tile_size = 96
+            scaled_floor = pygame.transform.scale(floor_tile, (tile_size, tile_size))
+            for tx in range(cx, cx + cw, tile_size):
+                for ty in range(cy, cy + ch, tile_size):
+                    clip_w = min(tile_size, cx + cw - tx)
+                    clip_h = min(tile_size, cy + ch - ty)
+                    if clip_w > 0 and clip_h > 0:
+                        if clip_w >= tile_size and clip_h >= tile_size:
+                            surface.blit(scaled_floor, (tx, ty))
+                        else:
+                            clipped = scaled_floor.subsurface(
+                                (0, 0, min(clip_w, tile_size), min(clip_h, tile_size))
+                            )
+                            surface.blit(clipped, (tx, ty))
+        else:
+            pygame.draw.rect(surface, (18, 40, 15), (cx, cy, cw, ch))
+
+        # ---- Dark undergrowth spots ----
+        for _ in range(max(1, int(cw * ch / 250))):
+            ux = cx + rng.randint(0, max(1, cw - 1))
+            uy = cy + rng.randint(0, max(1, ch - 1))
+            us = rng.randint(5, 12)
+            g = rng.randint(18, 40)
+            pygame.draw.circle(surface, (g - 8, g, g - 10), (ux, uy), us)
+
+        # ---- Place tree canopies from assets ----
+        available = [c for c in [canopy1, canopy2] if c is not None]
+
+        if available:
+            margin = 25
+            safe_w = max(1, cw - margin * 2)
+            safe_h = max(1, ch - margin * 2)
+            area = safe_w * safe_h
+            tree_count = max(3, int(area / 700))
+            if cap_trees:
+                tree_count = min(80, tree_count)
+
+            trees = []
+            for _ in range(tree_count):
+                tx = cx + rng.randint(margin, max(margin + 1, cw - margin))
+                ty = cy + rng.randint(margin, max(margin + 1, ch - margin))
+                size = rng.randint(50, 90)
+                rot = rng.choice([0, 90, 180, 270]) + rng.randint(-20, 20)
+                ci = rng.randint(0, len(available) - 1)
+                trees.append((tx, ty, size, rot, ci))
+
+            trees.sort(key=lambda t: t[1])
+
+            for tx, ty, size, rot, ci in trees:
+                rotated, shadow = atlas.get(available[ci], size, rot)
+
+                # Shadow (dark version, offset)
+                sr = shadow.get_rect(center=(tx + 5, ty + 5))
+                surface.blit(shadow, sr)
+
+                # Canopy
+                cr = rotated.get_rect(center=(tx, ty))
+                surface.blit(rotated, cr)
+        else:
+            # Fallback: procedural trees if no assets found
+            margin = 10
+            area = max(1, (cw - margin * 2) * (ch - margin * 2))
+            tree_count = max(2, int(area / 400))
+            if cap_trees:
+                tree_count = min(80, tree_count)
+
+            trees = []
+            for _ in range(tree_count):
+                tx = cx + rng.randint(margin, max(margin + 1, cw - margin))
+                ty = cy + rng.randint(margin, max(margin + 1, ch - margin))
+                sz = rng.randint(14, 24)
+                trees.append((tx, ty, sz))
+
+            trees.sort(key=lambda t: t[1])
+
+            for tx, ty, sz in trees:
+                gv = rng.randint(-15, 15)
+                pygame.draw.circle(
+                    surface, (8, 18, 6), (tx + 3, ty + 3), sz + 2
+                )
+                pygame.draw.circle(
+                    surface, (28 + gv, 85 + gv, 22 + gv), (tx, ty), sz
+                )
+                pygame.draw.circle(
+                    surface,
+                    (38 + gv, 110 + gv, 30 + gv),
+                    (tx - 1, ty - 1),
+                    int(sz * 0.75),
+                )
+                pygame.draw.circle(
+                    surface,
+                    (55 + gv, 145 + gv, 42 + gv),
+                    (tx - sz // 4, ty - sz // 4),
+                    int(sz * 0.5),
+                )
+                pygame.draw.circle(
+                    surface,
+                    (70 + gv, 170 + gv, 55 + gv),
+                    (tx - sz // 3, ty - sz // 3),
+                    int(sz * 0.28),
+                )
+
+    # ---- Forest edge (border where forest meets water) ----
+    for cx, cy, cw, ch in cubes:
+        pygame.draw.rect(surface, (10, 28, 8), (cx, cy, cw, ch), 3)
+
+    return surface
+
+
+# ================================================================
+# ROCK RENDERING - Pre-rendered stone obstacles
+# ================================================================
+def create_rock_surface(cubes, w, h, seed=314):
+    """Pre-render rock obstacles as gray/brown stone shapes."""
+    surface = pygame.Surface((w, h), pygame.SRCALPHA)
+    rng = random.Random(seed)
+
+    for cx, cy, cw, ch in cubes:
+        # Base rock fill
+        pygame.draw.rect(surface, (85, 78, 68), (cx, cy, cw, ch))
+
+        # Irregular stone texture
+        num_stones = max(3, int(cw * ch / 500))
+        for _ in range(num_stones):
+            sx = cx + rng.randint(2, max(3, cw - 2))
+            sy = cy + rng.randint(2, max(3, ch - 2))
+            stone_size = rng.randint(6, 18)
+            num_verts = rng.randint(5, 8)
+            points = []
+            for i in range(num_verts):
+                ang = (i / num_verts) * math.pi * 2
+                r = stone_size * rng.uniform(0.5, 1.0)
+                px = max(cx, min(cx + cw, sx + math.cos(ang) * r))
+                py = max(cy, min(cy + ch, sy + math.sin(ang) * r))
+                points.append((int(px), int(py)))
+            if len(points) >= 3:
+                gray = rng.randint(55, 125)
+                brown = rng.randint(0, 20)
+                color = (min(255, gray + brown), min(255, gray + brown // 2), max(0, gray - brown // 2))
+                pygame.draw.polygon(surface, color, points)
+                highlight = tuple(min(255, c + 25) for c in color)
+                pygame.draw.polygon(surface, highlight, points, 1)
+
+        # Crack lines
+        for _ in range(max(1, int(cw * ch / 1500))):
+            lx1 = cx + rng.randint(3, max(4, cw - 3))
+            ly1 = cy + rng.randint(3, max(4, ch - 3))
+            lx2 = max(cx, min(cx + cw, lx1 + rng.randint(-25, 25)))
+            ly2 = max(cy, min(cy + ch, ly1 + rng.randint(-25, 25)))
+            pygame.draw.line(surface, (45, 40, 35), (lx1, ly1), (lx2, ly2), 1)
+
+        # Dark border
+        pygame.draw.rect(surface, (40, 35, 30), (cx, cy, cw, ch), 2)
+
+    return surface
+
+
+# ================================================================
+# LAYER JOBS - what to build, cached on disk, optionally in parallel
+# ================================================================
+def forest_job(cubes, w, h, cap_trees=False, seed=42):
+    return ("forest", [tuple(c) for c in cubes], w, h, seed, cap_trees)
+
+
+def rock_job(cubes, w, h, seed=314):
+    return ("rock", [tuple(c) for c in cubes], w, h, seed)
+
+
+def fields_job(rects, w, h):
+    """A level's DistanceField and FlowField, as a job (see build_fields)."""
+    return ("fields", [tuple(r) for r in rects], w, h)
+
+
+def build_fields(job):
+    """Worker entry point for a fields job: ``(field, flow)``.
+
+    Both are plain data, so they pickle back to the game like layer pixels;
+    level_cache loads them from disk or builds and caches them.
+    """
+    _, rects, w, h = job
+    field = level_cache.cached_distance_field(rects, w, h)
+    return field, level_cache.cached_flow_field(rects, field)
+
+
+def job_key(job):
+    """Disk cache key of a layer job (None for a fields job, which
+    level_cache caches under its own keys).
+    """
+    if job[0] == "fields":
+        return None
+    kind, cubes, w, h, seed = job[:5]
+    if kind == "forest":
+        return level_cache.layer_key(
+            create_forest_surface, cubes, seed, (w, h), FOREST_ASSET_PATHS,
+            (job[5], CanopyAtlas.SIZE_STEP, CanopyAtlas.TILT_STEP),
+            helpers=(CanopyAtlas.get,),
+        )
+    return level_cache.layer_key(create_rock_surface, cubes, seed, (w, h))
+
+
+def build_job(job, atlas=None, report_missing=True):
+    """Build a layer job's surface in this process."""
+    kind, cubes, w, h, seed = job[:5]
+    if kind == "forest":
+        floor_tile, canopy1, canopy2 = forest_assets(report_missing)
+        return create_forest_surface(
+            cubes, w, h, floor_tile, canopy1, canopy2, job[5], seed, atlas
+        )
+    return create_rock_surface(cubes, w, h, seed)
+
+
+def render_job_pixels(job, cache_key=None):
+    """Worker entry point: produce a layer and return it as raw RGBA pixels.
+
+    With a ``cache_key`` the layer is loaded from the disk cache, or built
+    and saved there, so neither the PNG decode nor the encode runs in the
+    game's process. Returns ``(size, pixels, atlas_stats)``; surfaces do not
+    pickle, so the main process rebuilds one with ``surface_from_pixels``.
+    """
+    atlas = CanopyAtlas()
+    surface = level_cache.load_layer(cache_key) if cache_key else None
+    if surface is None:
+        surface = build_job(job, atlas, report_missing=False)
+        if cache_key:
+            level_cache.save_layer(cache_key, surface)
+    return surface.get_size(), pygame.image.tobytes(surface, "RGBA"), atlas.stats()
+
+
+def surface_from_pixels(size, pixels):
+    surface = pygame.image.frombuffer(pixels, size, "RGBA")
+    # Match the display format so the layer blits fast every frame
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+
+def _report_atlas(stats):
+    """Print the canopy atlas totals over several ``CanopyAtlas.stats()``."""
+    totals = [sum(column) for column in zip(*stats)]
+    if totals and (totals[0] or totals[1]):
+        print(CanopyAtlas.format_report(*totals))
+
+
+class LayerPool:
+    """Worker processes that build layer (and fields) jobs.
+
+    Each worker is a fresh ``python -m level_builders`` process (never
+    forked from a process with a live window and audio thread), so it only
+    imports the modules its jobs need. A spawned multiprocessing worker
+    would re-run its parent's ``__main__``, and the game scripts build
+    their levels and run their loop at import. A job goes to a worker on
+    stdin as the qualified name of its function plus the pickled
+    arguments, and the pickled result comes back on stdout. A thread per
+    worker drives it, so ``submit`` returns a concurrent.futures Future.
+    """
+
+    def __init__(self, workers=None):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._processes = []
+        self._closed = False
+
+    def submit(self, job, cache_key=None):
+        """Queue ``job``; its future resolves to ``render_job_pixels`` output
+        (``build_fields`` output for a fields job).
+        """
+        if job[0] == "fields":
+            return self._executor.submit(self._call, build_fields, job)
+        return self._executor.submit(self._call, render_job_pixels, job, cache_key)
+
+    def _worker(self):
+        """This thread's worker process, started on first use."""
+        process = getattr(self._local, "process", None)
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                [sys.executable, "-m", "level_builders"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"),
+            )
+            with self._lock:
+                if self._closed:
+                    process.kill()
+                    raise RuntimeError("the layer pool is shut down")
+                self._processes.append(process)
+            self._local.process = process
+        return process
+
+    def _call(self, func, *args):
+        process = self._worker()
+        try:
+            pickle.dump((func.__module__, func.__qualname__, args), process.stdin)
+            process.stdin.flush()
+            ok, result = pickle.load(process.stdout)
+        except (OSError, EOFError, pickle.UnpicklingError) as e:
+            process.kill()
+            raise RuntimeError(f"the level worker stopped: {e!r}") from e
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            processes, self._processes = self._processes, []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.kill()
+            process.wait()
+
+
+def serve_jobs():
+    """Worker loop of a LayerPool process: run jobs from stdin until it closes."""
+    jobs = sys.stdin.buffer
+    results = sys.stdout.buffer
+    # The results own stdout; anything the jobs print goes to stderr
+    sys.stdout = sys.stderr
+    while True:
+        try:
+            module, name, args = pickle.load(jobs)
+        except EOFError:
+            return
+        try:
+            reply = True, getattr(importlib.import_module(module), name)(*args)
+        except Exception as e:
+            reply = False, f"{name} failed: {e!r}"
+        pickle.dump(reply, results)
+        results.flush()
+
+
+def build_layers(jobs, workers=None, use_cache=True):
+    """Build the surfaces of ``jobs``, in parallel when more than one misses.
+
+    Cached layers are loaded from disk; the rest are built in a LayerPool of
+    ``workers`` processes (None = one per CPU; 0 or 1 builds them one after
+    another in this process) and cached. Returns the surfaces in job order.
+    """
+    keys = [job_key(job) if use_cache else None for job in jobs]
+    surfaces = [level_cache.load_layer(key) if key else None for key in keys]
+    missing = [i for i, surface in enumerate(surfaces) if surface is None]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(missing))
+
+    # Starting a worker costs over half a second, so one job (or one CPU) is
+    # built right here
+    if workers > 1:
+        pool = LayerPool(workers)
+        try:
+            futures = {i: pool.submit(jobs[i], keys[i]) for i in missing}
+            stats = []
+            for i, future in futures.items():
+                size, pixels, job_stats = future.result()
+                surfaces[i] = surface_from_pixels(size, pixels)
+                stats.append(job_stats)
+        finally:
+            pool.shutdown()
+    else:
+        atlas = CanopyAtlas()
+        for i in missing:
+            surfaces[i] = build_job(jobs[i], atlas)
+            if keys[i]:
+                level_cache.save_layer(keys[i], surfaces[i])
+        stats = [atlas.stats()]
+
+    _report_atlas(stats)
+    return surfaces
+
+
+class LevelBuild:
+    """One level's layers, built in the background while the game runs.
+
+    ``start()`` hands the jobs to a LayerPool, whose workers load them from
+    the disk cache or build and cache them. ``poll()`` is called every frame
+    and, once all results are in, passes them to ``on_ready`` (in job order:
+    a surface per layer job, ``(field, flow)`` per fields job). Without a
+    pool the jobs are built on ``start()``, and so they are if the pool
+    fails (a worker error or a broken pool).
+
+    ``on_ready`` may be a generator function: it is then run one step (up
+    to its next ``yield``) per ``poll()``, so the main-thread setup is
+    spread over several frames. ``poll()`` returns True once it is done.
+    """
+
+    def __init__(self, jobs, on_ready, pool=None, use_cache=True):
+        self.jobs = jobs
+        self.on_ready = on_ready
+        self.pool = pool
+        self.use_cache = use_cache
+        self.started = False
+        self.ready = False
+        self._futures = []
+        self._steps = None
+
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        if self.pool is None:
+            self._build_here()
+            return
+        try:
+            self._futures = [
+                self.pool.submit(job, job_key(job) if self.use_cache else None)
+                for job in self.jobs
+            ]
+        except Exception as e:
+            print(f"Could not start the background level build: {e}")
+            self._build_here()
+
+    def poll(self):
+        """Collect finished jobs or run one setup step; True once ready to play."""
+        if self._steps is not None:
+            try:
+                next(self._steps)
+            except StopIteration:
+                self._steps = None
+                self.ready = True
+            return self.ready
+        if self.ready or not self._futures:
+            return self.ready
+        if all(future.done() for future in self._futures):
+            futures, self._futures = self._futures, []
+            try:
+                results = [future.result() for future in futures]
+            except Exception as e:
+                print(f"Could not build level layers in the background: {e}")
+                self._build_here()
+                return self.ready
+            stats = []
+            for i, (job, result) in enumerate(zip(self.jobs, results)):
+                if job[0] != "fields":
+                    size, pixels, job_stats = result
+                    results[i] = surface_from_pixels(size, pixels)
+                    stats.append(job_stats)
+            _report_atlas(stats)
+            self._finish(results)
+        return self.ready
+
+    def _build_here(self):
+        layers = iter(build_layers(
+            [job for job in self.jobs if job[0] != "fields"], workers=0, use_cache=self.use_cache
+        ))
+        self._finish([build_fields(job) if job[0] == "fields" else next(layers) for job in self.jobs])
+
+    def _finish(self, results):
+        steps = self.on_ready(*results)
+        if inspect.isgenerator(steps):
+            self._steps = steps
+        else:
+            self.ready = True
+
+
+if __name__ == "__main__":
+    serve_jobs()
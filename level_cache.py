@@ -0,0 +1,150 @@
+import hashlib
+import os
+
+import pygame
+
+from collision import DistanceField
+from flow_field import FlowField
+
+# ================================================================
+# ON-DISK CACHE FOR PRE-RENDERED LEVEL LAYERS
+# ================================================================
+# Forest and rock layers are deterministic: the same cube list, RNG seed,
+# source assets, target size and builder code always produce the same
+# pixels. Each layer is stored as a PNG named after a hash of all of those,
+# so a warm launch just loads the image, and any change to one of the
+# inputs simply misses the cache and rebuilds.
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "layers")
+# Distance and flow fields are cached the same way, as raw float32 samples
+FIELD_DIR = os.path.join(os.path.dirname(CACHE_DIR), "fields")
+
+
+def _hash_code(h, code):
+    h.update(code.co_code)
+    for const in code.co_consts:
+        # Nested code objects (lambdas, comprehensions) repr with their
+        # memory address, so hash their contents instead
+        if hasattr(const, "co_code"):
+            _hash_code(h, const)
+        else:
+            h.update(repr(const).encode())
+
+
+def layer_key(builder, cubes, seed, size, asset_paths=(), options=(), helpers=()):
+    """Hash everything a pre-rendered layer depends on into a cache key.
+
+    ``helpers`` are extra functions whose code shapes the layer's pixels.
+    """
+    h = hashlib.sha256()
+    # Builder code, so editing a builder invalidates its cached layers
+    h.update(builder.__name__.encode())
+    for fn in (builder,) + tuple(helpers):
+        _hash_code(h, fn.__code__)
+    h.update(repr([tuple(c) for c in cubes]).encode())
+    h.update(repr((seed, tuple(size), tuple(options))).encode())
+    for path in asset_paths:
+        h.update(os.path.basename(path).encode())
+        try:
+            with open(path, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(b"<missing>")
+    return f"{builder.__name__}-{h.hexdigest()[:24]}"
+
+
+def load_layer(key):
+    """Return the cached layer surface for ``key``, or None on a miss."""
+    path = os.path.join(CACHE_DIR, key + ".png")
+    if not os.path.exists(path):
+        return None
+    try:
+        return pygame.image.load(path)
+    except Exception as e:
+        print(f"Could not load cached layer {path}: {e}")
+        return None
+
+
+def save_layer(key, surface):
+    path = os.path.join(CACHE_DIR, key + ".png")
+    tmp_path = path + ".tmp.png"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        pygame.image.save(surface, tmp_path)
+        # Atomic swap so a crash mid-write never leaves a truncated layer
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Could not cache layer {path}: {e}")
+
+
+def cached_layer(key, build):
+    """Load layer ``key`` from disk, or ``build()`` it and cache the result."""
+    surface = load_layer(key)
+    if surface is None:
+        surface = build()
+        save_layer(key, surface)
+    return surface
+
+
+def _read_field(path, what):
+    """Raw bytes of a cached field, or None on a miss."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError as e:
+        print(f"Could not load cached {what} {path}: {e}")
+        return None
+
+
+def _write_field(path, data, what):
+    tmp_path = path + ".tmp"
+    try:
+        os.makedirs(FIELD_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not cache {what} {path}: {e}")
+
+
+def cached_distance_field(rects, w, h, cell=5, max_dist=128):
+    """DistanceField.from_rects, loaded from disk when the level is unchanged."""
+    key = layer_key(
+        DistanceField.from_rects, rects, None, (w, h), options=(cell, max_dist),
+        helpers=(DistanceField._fill_numpy, DistanceField._fill_python, DistanceField._window),
+    )
+    path = os.path.join(FIELD_DIR, key + ".f32")
+    data = _read_field(path, "distance field")
+    if data is not None:
+        field = DistanceField.from_bytes(data, w, h, cell, max_dist)
+        if field is not None:
+            return field
+
+    field = DistanceField.from_rects(rects, w, h, cell, max_dist)
+    _write_field(path, field.to_bytes(), "distance field")
+    return field
+
+
+def cached_flow_field(rects, field, cell=10, edge_falloff=60):
+    """FlowField.from_field over ``field`` (built from ``rects``), cached on disk."""
+    key = layer_key(
+        FlowField.from_field, rects, None, (field.w, field.h),
+        options=(field.cell, field.max_dist, cell, edge_falloff),
+        helpers=(
+            DistanceField._fill_numpy, DistanceField._fill_python, DistanceField._window,
+            FlowField._boundary, FlowField._omega, FlowField._solve_numpy,
+            FlowField._solve_python, FlowField._set_velocity, FlowField._slope,
+        ),
+    )
+    path = os.path.join(FIELD_DIR, key + ".f32")
+    data = _read_field(path, "flow field")
+    if data is not None:
+        flow = FlowField.from_bytes(data, field.w, field.h, cell)
+        if flow is not None:
+            return flow
+
+    flow = FlowField.from_field(field, cell, edge_falloff)
+    _write_field(path, flow.to_bytes(), "flow field")
+    return flow
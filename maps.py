@@ -3,12 +3,15 @@ import pygame
 import sys
 import math
 import os
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 # --- TMX loader (pip install pytmx) ---
 from pytmx.util_pygame import load_pygame
 import pytmx
 
+import level_cache
+from collision import OccupancyGrid
+
 pygame.init()
 
 # ==================================================
@@ -68,43 +71,164 @@ map_px_height = tmx.height * tile_h
 clock = pygame.time.Clock()
 
 # ==========================
-# Pre-render visible layers
+# Chunked map rendering
 # ==========================
-map_surface = pygame.Surface((map_px_width, map_px_height), pygame.SRCALPHA)
+# The map is drawn from fixed-size chunks rendered on demand from the tile
+# layers, so memory and load time follow the screen size, not the map size.
+CHUNK_TILES = 16         # chunk edge, in tiles
+CHUNK_CACHE_MARGIN = 1   # ring of chunks kept (and prefetched) around the view
 
-# Handles Tile layers even inside Group layers (e.g., your "Level1" group)
-for layer in tmx.visible_layers:
-    if isinstance(layer, pytmx.TiledTileLayer):
-        for x, y, gid in layer:
-            if gid == 0:
-                continue
-            img = tmx.get_tile_image_by_gid(gid)
-            if img:
-                map_surface.blit(img, (x * tile_w, y * tile_h))
+
+class ChunkCache:
+    """Lazily rendered map chunks, evicted by distance to the camera.
+
+    The cache holds the chunks covering the view plus a CHUNK_CACHE_MARGIN
+    ring; past that, the chunk farthest from the camera (least recently used
+    on ties) is dropped.
+    """
+
+    def __init__(self, tmx_map, view_w, view_h, chunk_tiles=CHUNK_TILES, margin=CHUNK_CACHE_MARGIN):
+        self.tmx = tmx_map
+        # Handles Tile layers even inside Group layers (e.g., your "Level1" group)
+        self.layers = [lyr for lyr in tmx_map.visible_layers if isinstance(lyr, pytmx.TiledTileLayer)]
+        self.chunk_tiles = chunk_tiles
+        self.chunk_w = chunk_tiles * tmx_map.tilewidth
+        self.chunk_h = chunk_tiles * tmx_map.tileheight
+        self.cols = math.ceil(tmx_map.width / chunk_tiles)
+        self.rows = math.ceil(tmx_map.height / chunk_tiles)
+        self.margin = margin
+        self.capacity = (
+            (math.ceil(view_w / self.chunk_w) + 1 + 2 * margin)
+            * (math.ceil(view_h / self.chunk_h) + 1 + 2 * margin)
+        )
+        self.chunks: Dict[Tuple[int, int], Optional[pygame.Surface]] = {}
+        self.last_used: Dict[Tuple[int, int], int] = {}
+        self.frame = 0
+
+    def render_chunk(self, cx, cy) -> Optional[pygame.Surface]:
+        """Draw one chunk from the tile layers (None if it has no tiles)."""
+        x0, y0 = cx * self.chunk_tiles, cy * self.chunk_tiles
+        x1 = min(x0 + self.chunk_tiles, self.tmx.width)
+        y1 = min(y0 + self.chunk_tiles, self.tmx.height)
+        surface = None
+        for layer in self.layers:
+            for y in range(y0, y1):
+                row = layer.data[y]
+                for x in range(x0, x1):
+                    gid = row[x]
+                    if gid == 0:
+                        continue
+                    img = self.tmx.get_tile_image_by_gid(gid)
+                    if img:
+                        if surface is None:
+                            surface = pygame.Surface((self.chunk_w, self.chunk_h), pygame.SRCALPHA)
+                        surface.blit(img, ((x - x0) * self.tmx.tilewidth, (y - y0) * self.tmx.tileheight))
+        return surface
+
+    def chunk_range(self, camera, margin=0):
+        """Chunk columns and rows overlapping the camera view (+ margin)."""
+        cx0 = max(0, int(camera.x // self.chunk_w) - margin)
+        cy0 = max(0, int(camera.y // self.chunk_h) - margin)
+        cx1 = min(self.cols - 1, int((camera.x + camera.view_w - 1) // self.chunk_w) + margin)
+        cy1 = min(self.rows - 1, int((camera.y + camera.view_h - 1) // self.chunk_h) + margin)
+        return range(cx0, cx1 + 1), range(cy0, cy1 + 1)
+
+    def get(self, cx, cy, camera) -> Optional[pygame.Surface]:
+        key = (cx, cy)
+        if key not in self.chunks:
+            if len(self.chunks) >= self.capacity:
+                self.evict(camera)
+            self.chunks[key] = self.render_chunk(cx, cy)
+        self.last_used[key] = self.frame
+        return self.chunks[key]
+
+    def evict(self, camera):
+        center_x = camera.x + camera.view_w / 2
+        center_y = camera.y + camera.view_h / 2
+
+        def rank(key):
+            dx = (key[0] + 0.5) * self.chunk_w - center_x
+            dy = (key[1] + 0.5) * self.chunk_h - center_y
+            return (dx * dx + dy * dy, -self.last_used[key])
+
+        far = max(self.chunks, key=rank)
+        del self.chunks[far]
+        del self.last_used[far]
+
+    def draw(self, surface, camera):
+        self.frame += 1
+        cols, rows = self.chunk_range(camera)
+        for cy in rows:
+            for cx in cols:
+                chunk = self.get(cx, cy, camera)
+                if chunk is not None:
+                    surface.blit(chunk, (cx * self.chunk_w - camera.x, cy * self.chunk_h - camera.y))
+
+        # Prefetch at most one chunk of the margin ring per frame
+        cols, rows = self.chunk_range(camera, self.margin)
+        for cy in rows:
+            for cx in cols:
+                if (cx, cy) not in self.chunks:
+                    self.get(cx, cy, camera)
+                    return
+
+
+class Camera:
+    """Top-left of the view in map pixels, keeping the boat centered.
+
+    Stops at the map edges; a map smaller than the screen is centered.
+    """
+
+    def __init__(self, view_w, view_h, map_w, map_h):
+        self.view_w, self.view_h = view_w, view_h
+        self.map_w, self.map_h = map_w, map_h
+        self.x = 0
+        self.y = 0
+
+    def follow(self, target):
+        if self.map_w <= self.view_w:
+            self.x = -(self.view_w - self.map_w) // 2
+        else:
+            self.x = int(max(0, min(target.x - self.view_w / 2, self.map_w - self.view_w)))
+        if self.map_h <= self.view_h:
+            self.y = -(self.view_h - self.map_h) // 2
+        else:
+            self.y = int(max(0, min(target.y - self.view_h / 2, self.map_h - self.view_h)))
+
+
+VIEW_W, VIEW_H = screen.get_size()
+map_chunks = ChunkCache(tmx, VIEW_W, VIEW_H)
+camera = Camera(VIEW_W, VIEW_H, map_px_width, map_px_height)
 
 # ==========================
-# Build collision rectangles
+# Build the collision grid
 # ==========================
 # Treat these tile layers as blocking (present in your TMX):
 BLOCKING_LAYER_NAMES = {"Trees", "Puie"}
-collision_rects = []
+occupancy = OccupancyGrid(tmx.width, tmx.height, tile_w, tile_h)
 
-# (A) Any non-empty tile on blocking layers -> solid
-for layer in tmx.visible_layers:
-    if isinstance(layer, pytmx.TiledTileLayer) and layer.name in BLOCKING_LAYER_NAMES:
-        for x, y, gid in layer:
-            if gid != 0:
-                collision_rects.append(pygame.Rect(x * tile_w, y * tile_h, tile_w, tile_h))
-
-# (B) Any tile with tile property collide=true -> solid (optional / future-proof)
 for layer in tmx.visible_layers:
     if isinstance(layer, pytmx.TiledTileLayer):
+        blocking = layer.name in BLOCKING_LAYER_NAMES
         for x, y, gid in layer:
             if gid == 0:
                 continue
-            props = tmx.get_tile_properties_by_gid(gid)
-            if props and props.get("collide") is True:
-                collision_rects.append(pygame.Rect(x * tile_w, y * tile_h, tile_w, tile_h))
+            # (A) Any non-empty tile on blocking layers -> solid
+            # (B) Any tile with tile property collide=true -> solid (optional / future-proof)
+            props = None if blocking else tmx.get_tile_properties_by_gid(gid)
+            if blocking or (props and props.get("collide") is True):
+                occupancy.set_solid(x, y)
+
+# Solid tiles merged into a few maximal rectangles (debug drawing, broadphase)
+collision_rects = occupancy.merged_rects()
+print(f"[TMX] Collision: {occupancy.solid_count()} solid tiles -> {len(collision_rects)} rects")
+
+# Signed distance to the blocking tiles (cached on disk per map); the
+# boat collides where it is within its radius
+distance_field = level_cache.cached_distance_field(
+    collision_rects, map_px_width, map_px_height, cell=tile_w // 4
+)
+DEBUG_COLLISION = False  # F1 toggles the rect outlines
 
 # =========
 # Spawn logic
@@ -182,6 +306,7 @@ WIDTH, HEIGHT = map_px_width, map_px_height  # keep these aliases for later part
 
 INITIAL_BOAT_POS = pygame.Vector2(spawn_x, spawn_y)
 boat_pos = INITIAL_BOAT_POS.copy()
+camera.follow(boat_pos)
 boat_velocity = pygame.Vector2(0, 0)
 boat_angle = 0  # face up (forward vector is (0, -1))
 
@@ -232,13 +357,6 @@ down_pressed = False
 
 boat_collision_radius = 15  # adjust if you later switch to a bigger canoe sprite
 
-def circle_rect_collision(cx, cy, r, rect: pygame.Rect) -> bool:
-    closest_x = max(rect.left, min(cx, rect.right))
-    closest_y = max(rect.top,  min(cy, rect.bottom))
-    dx = cx - closest_x
-    dy = cy - closest_y
-    return (dx * dx + dy * dy) <= (r * r)
-
 timer_seconds = 60.0
 font = pygame.font.SysFont(None, 72)
 
@@ -286,6 +404,9 @@ while running:
                 last_input_time = current_time
                 input_this_frame = True
 
+            if event.key == pygame.K_F1:
+                DEBUG_COLLISION = not DEBUG_COLLISION
+
             if event.key == pygame.K_DOWN:
                 if not down_pressed:
                     down_pressed = True
@@ -356,12 +477,8 @@ while running:
     # Update position
     boat_pos += boat_velocity
 
-    # --- COLLISION WITH TMX RECTS ---
-    collided = False
-    for rect in collision_rects:
-        if circle_rect_collision(boat_pos.x, boat_pos.y, boat_collision_radius, rect):
-            collided = True
-            break
+    # --- COLLISION WITH THE BLOCKING TILES (one distance-field lookup) ---
+    collided = distance_field.circle_hits(boat_pos.x, boat_pos.y, boat_collision_radius)
 
     if collided:
         # Reset on collision
@@ -371,13 +488,20 @@ while running:
         rotating = False
 
     # --- DRAW ---
-    screen.blit(map_surface, (0, 0))
-    draw_boat(screen, boat_pos, boat_angle)
+    camera.follow(boat_pos)
+    screen.fill((0, 0, 0))
+    map_chunks.draw(screen, camera)
+    if DEBUG_COLLISION:
+        view = pygame.Rect(camera.x, camera.y, VIEW_W, VIEW_H)
+        for rect in collision_rects:
+            if rect.colliderect(view):
+                pygame.draw.rect(screen, (255, 0, 0), rect.move(-camera.x, -camera.y), 1)
+    draw_boat(screen, boat_pos - pygame.Vector2(camera.x, camera.y), boat_angle)
 
     #Timer
     timer_color = (255, 0, 0) if timer_seconds <= 10 else (255, 255, 255)  # red if <= 10 seconds, white otherwise
     timer_text = font.render(f"{timer_seconds:.1f}", True, timer_color)
-    timer_rect = timer_text.get_rect(midtop=(WIDTH // 2, 20))
+    timer_rect = timer_text.get_rect(midtop=(VIEW_W // 2, 20))
 
     #Shake effect for timer
     if timer_seconds <= 10:
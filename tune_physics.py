@@ -0,0 +1,297 @@
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from batch_sim import BoatBatch, default_handling
+from boat_physics import PHYSICS_DT, REFERENCE_HZ
+
+# ================================================================
+# HANDLING AUTO-TUNER (headless, parallel)
+# ================================================================
+# Searches the handling constants for a set that matches target metrics.
+# Every candidate rows through the same scripted inputs in the batch
+# simulator; each worker process simulates a whole chunk of candidates as
+# one batch.
+#
+#   python tune_physics.py --measure
+#   python tune_physics.py --time-to-top 1.2 --turn-radius 150 --drift 40
+
+# Search space: (low, high) per constant
+BOUNDS = {
+    "BASE_ACCEL": (0.2, 1.5),
+    "ACCEL_PER_PRESS": (0.1, 1.0),
+    "BASE_FRICTION": (0.95, 0.999),
+    "SIDEWAYS_FRICTION": (0.9, 0.999),
+    "SIDEWAYS_DRIFT_MULT": (0.2, 1.5),
+    "SINGLE_KEY_ACCEL_MULT": (0.3, 1.2),
+    "SINGLE_KEY_SIDEWAYS_MULT": (0.2, 1.2),
+}
+
+# Constants of the older scripts, for --measure
+PRESETS = {
+    "week2": default_handling(),
+    "update1": dict(
+        MAX_SPEED=12, BASE_ACCEL=0.8, ACCEL_PER_PRESS=0.5, BASE_FRICTION=0.98,
+        SIDEWAYS_FRICTION=0.92, SIDEWAYS_DRIFT_MULT=1.0,
+        SINGLE_KEY_ACCEL_MULT=1.0, SINGLE_KEY_SIDEWAYS_MULT=1.0,
+    ),
+}
+
+METRICS = ("top_speed", "time_to_top", "turn_radius", "drift")
+UNITS = {"top_speed": "px/s", "time_to_top": "s", "turn_radius": "px", "drift": "px"}
+
+STROKE_TICKS = 10  # a stroke every 1/6 s, about a steady player's rhythm
+ROW_TICKS = 4 * 60
+TURN_TICKS = 3 * 60
+COAST_TICKS = 3 * 60
+
+
+def _stroke(batch, key, tick):
+    if tick % STROKE_TICKS == 0:
+        batch.paddle(key)
+    elif tick % STROKE_TICKS == 1:
+        batch.release(key)
+
+
+def _row(batch, ticks, on_tick=None):
+    """Alternate left and right strokes for ``ticks`` ticks."""
+    for tick in range(ticks):
+        _stroke(batch, "left" if tick // STROKE_TICKS % 2 == 0 else "right", tick)
+        batch.pos += batch.step(PHYSICS_DT)
+        if on_tick is not None:
+            on_tick(tick)
+
+
+def measure(handling, n=None):
+    """Handling metrics for each candidate in ``handling`` (name -> array).
+
+    - top_speed: peak speed while rowing (alternate strokes)
+    - time_to_top: seconds of rowing to reach 90% of that peak
+    - turn_radius: path length over heading change while stroking one
+      side, from rowing speed
+    - drift: sideways travel (across the heading) after one turn stroke
+      at rowing speed, until the boat stops
+
+    Returns an ``(n, len(METRICS))`` array.
+    """
+    if n is None:
+        n = len(next(iter(handling.values())))
+    out = np.zeros((n, len(METRICS)))
+
+    # Rowing: top speed and how fast the boat gets there
+    batch = BoatBatch(n, (0, 0), handling=handling)
+    speeds = np.zeros((ROW_TICKS, n))
+
+    def record(tick):
+        speeds[tick] = np.hypot(batch.vel[:, 0], batch.vel[:, 1])
+
+    _row(batch, ROW_TICKS, record)
+    peak = speeds.max(axis=0)
+    reached = speeds >= 0.9 * peak
+    out[:, 0] = peak * REFERENCE_HZ
+    out[:, 1] = (reached.argmax(axis=0) + 1) * PHYSICS_DT
+
+    # Turning: keep stroking the left oar from rowing speed
+    batch = BoatBatch(n, (0, 0), handling=handling)
+    _row(batch, ROW_TICKS)
+    path = np.zeros(n)
+    turned = np.zeros(n)
+    for tick in range(TURN_TICKS):
+        before = batch.angle.copy()
+        _stroke(batch, "left", tick)
+        move = batch.step(PHYSICS_DT)
+        batch.pos += move
+        path += np.hypot(move[:, 0], move[:, 1])
+        turned += np.abs((batch.angle - before + 180) % 360 - 180)
+    out[:, 2] = path / np.maximum(np.radians(turned), 1e-9)
+
+    # Drift: one left stroke from rowing speed, then coast
+    batch = BoatBatch(n, (0, 0), handling=handling)
+    _row(batch, ROW_TICKS)
+    for key in ("left", "right"):
+        batch.release(key)
+    batch.paddle("left")
+    drift = np.zeros(n)
+    for tick in range(COAST_TICKS):
+        if tick == 1:
+            batch.release("left")
+        move = batch.step(PHYSICS_DT)
+        batch.pos += move
+        rad = np.radians(batch.angle)
+        drift += np.abs(move[:, 0] * np.cos(rad) + move[:, 1] * np.sin(rad))
+    out[:, 3] = drift
+    return out
+
+
+def _measure_chunk(chunk):
+    """Worker entry point: ``(metrics, seconds)`` for a dict of arrays."""
+    start = time.perf_counter()
+    metrics = measure(chunk)
+    return metrics, time.perf_counter() - start
+
+
+def score(metrics, targets):
+    """Sum of squared relative errors against the targets given."""
+    total = np.zeros(len(metrics))
+    for name, target in targets.items():
+        value = metrics[:, METRICS.index(name)]
+        total += ((value - target) / target) ** 2
+    return total
+
+
+def tune(targets, population=256, generations=12, elite=16, workers=None, seed=0):
+    """Search BOUNDS for the handling that best fits ``targets``.
+
+    A simple evolution strategy: the first generation is spread over the
+    bounds (plus the current constants), each later one is the best
+    ``elite`` and mutations of them with a shrinking step. Generations are
+    split into one chunk per worker process (None = one per CPU, and never
+    more than the population). Targets must be positive and there must be
+    at least one generation; ``elite`` is capped at half the population.
+
+    Returns ``(best_handling, best_metrics, report)``.
+    """
+    if population < 2:
+        raise ValueError("population must be at least 2")
+    if generations < 1:
+        raise ValueError("generations must be at least 1")
+    if any(target <= 0 for target in targets.values()):
+        raise ValueError("targets must be positive")
+    elite = max(1, min(elite, population // 2))
+    rng = np.random.default_rng(seed)
+    names = list(BOUNDS)
+    low = np.array([BOUNDS[name][0] for name in names])
+    high = np.array([BOUNDS[name][1] for name in names])
+    current = default_handling()
+    workers = min(workers or os.cpu_count() or 1, population)
+
+    pop = rng.uniform(low, high, (population, len(names)))
+    pop[0] = np.clip([current[name] for name in names], low, high)
+
+    report = {"workers": workers, "generations": [], "sim_seconds": 0.0}
+    start = time.perf_counter()
+    executor = None
+    if workers > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        best = None
+        for gen in range(generations):
+            gen_start = time.perf_counter()
+            chunks = np.array_split(pop, workers)
+            handling = [{name: chunk[:, i] for i, name in enumerate(names)} for chunk in chunks]
+            if executor is not None:
+                results = list(executor.map(_measure_chunk, handling))
+            else:
+                results = [_measure_chunk(chunk) for chunk in handling]
+            metrics = np.concatenate([m for m, _ in results])
+            report["sim_seconds"] += sum(secs for _, secs in results)
+
+            scores = score(metrics, targets)
+            order = np.argsort(scores)
+            if best is None or scores[order[0]] < best[0]:
+                best = (scores[order[0]], pop[order[0]].copy(), metrics[order[0]].copy())
+            report["generations"].append((time.perf_counter() - gen_start, float(scores[order[0]])))
+
+            parents = pop[order[:elite]]
+            sigma = (high - low) * 0.25 * 0.7 ** gen
+            children = parents[rng.integers(0, elite, population - elite)]
+            children = children + rng.normal(0, 1, children.shape) * sigma
+            pop = np.clip(np.concatenate([parents, children]), low, high)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    report["total_seconds"] = time.perf_counter() - start
+    report["evaluations"] = population * generations
+
+    best_handling = dict(current)
+    best_handling.update({name: float(v) for name, v in zip(names, best[1])})
+    return best_handling, best[2], report
+
+
+def format_metrics(metrics, targets=None):
+    lines = []
+    for i, name in enumerate(METRICS):
+        line = f"  {name:12} {metrics[i]:9.2f} {UNITS[name]}"
+        if targets and name in targets:
+            line += f"   (target {targets[name]:g})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def format_report(report):
+    ticks = ROW_TICKS * 3 + TURN_TICKS + COAST_TICKS
+    lines = [f"  {report['workers']} worker(s); generation 0 includes starting them"]
+    for gen, (secs, best) in enumerate(report["generations"]):
+        lines.append(f"  generation {gen:2}: {secs:6.2f}s  best score {best:.5f}")
+    total = report["total_seconds"]
+    lines.append(
+        f"  {report['evaluations']} candidates in {total:.2f}s"
+        f" ({report['evaluations'] / total:.0f}/s,"
+        f" {report['evaluations'] * ticks / total / 1e6:.1f}M boat ticks/s;"
+        f" {report['sim_seconds']:.2f}s simulating across workers)"
+    )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune the boat handling constants.")
+    parser.add_argument("--measure", action="store_true", help="print the metrics of the presets")
+    parser.add_argument("--top-speed", type=float, help="peak rowing speed (px/s)")
+    parser.add_argument("--time-to-top", type=float, help="seconds to 90%% of peak speed")
+    parser.add_argument("--turn-radius", type=float, help="turn radius stroking one side (px)")
+    parser.add_argument("--drift", type=float, help="sideways drift after one turn stroke (px)")
+    parser.add_argument("--population", type=int, default=256)
+    parser.add_argument("--generations", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.measure:
+        for name, handling in PRESETS.items():
+            metrics = measure({k: np.array([v]) for k, v in handling.items()})
+            print(f"{name}:")
+            print(format_metrics(metrics[0]))
+        return
+
+    targets = {
+        name: value
+        for name, value in (
+            ("top_speed", args.top_speed),
+            ("time_to_top", args.time_to_top),
+            ("turn_radius", args.turn_radius),
+            ("drift", args.drift),
+        )
+        if value is not None
+    }
+    if not targets:
+        parser.error("give at least one target (or --measure)")
+    for name, value in targets.items():
+        if value <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    if args.population < 2:
+        parser.error("--population must be at least 2")
+    if args.generations < 1:
+        parser.error("--generations must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    best, metrics, report = tune(
+        targets, args.population, args.generations, workers=args.workers, seed=args.seed
+    )
+    print("Best handling (paste into boat_physics.py):")
+    for name in BOUNDS:
+        print(f"{name} = {best[name]:.4g}")
+    print("Metrics:")
+    print(format_metrics(metrics, targets))
+    print("Timing:")
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
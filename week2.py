@@ -3,6 +3,19 @@ import sys
 import math
 import random
 import os
+import bisect
+
+import boat_physics
+import level_builders
+from boat_physics import PHYSICS_DT, BoatControls, BoatState, FixedTimestep
+from collision import MaskCollider, UniformGrid
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
 
 pygame.init()
 
@@ -123,20 +136,92 @@ def load_image(subdir, filename, size=None):
         return None
 
 
-tree_canopy1 = load_image("obstacles", "forest1-removebg-preview.png")
-tree_canopy2 = load_image("obstacles", "forest2-removebg-preview.png")
-forest_floor = load_image("obstacles", "forest_tile.png")
-
 
 # ================================================================
 # WATER ANIMATION SYSTEM
 # ================================================================
 class WaterRenderer:
-    """Animated river water with layered waves, flow particles, and sparkles."""
+    """Animated river water with layered waves, flow particles, and sparkles.
+
+    ``backend`` picks how the waves are produced: ``"python"`` loops over
+    every vertex, ``"numpy"`` evaluates each layer as one broadcast sine over
+    its row/column grid and draws the same pixels, and ``"shader"`` shades
+    every pixel of a ``shader_scale`` internal buffer with surfarray (waves
+    and caustics travelling along ``flow``) and upscales it.
+
+    With ``baked=True`` each wave layer is rendered once into a strip one
+    horizontal wave period wider than the screen (lazily, or up front via
+    ``prebake``): a phase shift of a sine is a horizontal shift, so every
+    draw is the base fill plus one colorkeyed blit per layer at the offset
+    for its phase, and the waves keep their exact speeds. Layer 3's detail
+    term moves at its own speed, so that layer gets ``phase_steps`` strips,
+    one per detail phase. Flow particles and sparkles are still drawn live
+    on top.
+    """
+
+    # Palette of the wave pass: deep water base, then wave layers 1-4
+    WAVE_COLORS = [
+        (22, 52, 138),
+        (35, 72, 175),
+        (48, 92, 198),
+        (60, 112, 215),
+        (72, 130, 230),
+    ]
+    # Phase speed (rad/s) of layers 1, 2, 3, layer 3's detail term, and 4
+    PHASE_RATES = (0.7, -0.45, 0.9, 0.9 * 0.6, 0.35)
+    # How far a wave line can reach from its row (amplitude + line width)
+    WAVE_REACH = 12
+    # Wave layers (geometry mirrors _render_waves_python):
+    # (first row, row step, vertex step, line width,
+    #  [(phase index, x freq, y freq, amplitude), ...])
+    WAVE_LAYERS = [
+        (0, 16, 8, 3, [(0, 0.009, 0.003, 5)]),
+        (4, 22, 10, 2, [(1, 0.014, 0.005, 3.5)]),
+        (8, 30, 12, 2, [(2, 0.006, 0.001, 7), (3, 0.02, 0.001, 2)]),
+        (2, 38, 10, 1, [(4, 0.011, 0.002, 4)]),
+    ]
 
-    def __init__(self, w, h):
+    def __init__(self, w, h, backend="python", baked=False, phase_steps=16,
+                 shader_scale=0.25, flow=(0, 1)):
         self.w, self.h = w, h
 
+        if backend in ("numpy", "shader") and not NUMPY_AVAILABLE:
+            print("NumPy not available, using the python water backend")
+            backend = "python"
+        if backend not in ("python", "numpy", "shader"):
+            raise ValueError(f"Unknown water backend: {backend}")
+        if backend == "shader" and baked:
+            raise ValueError("The shader water backend cannot be baked")
+        self.backend = backend
+
+        if backend == "shader":
+            self._init_shader(shader_scale, flow)
+
+        # Per-layer vertex grids for the numpy backend, built once
+        self._np_layers = []
+        if backend == "numpy":
+            for (y0, y_step, x_step, width, terms), color in zip(
+                self.WAVE_LAYERS, self.WAVE_COLORS[1:]
+            ):
+                ys = np.arange(y0, h, y_step)
+                xs = np.arange(0, w + x_step, x_step)
+                verts = np.empty((len(ys), len(xs), 2), dtype=np.int64)
+                verts[:, :, 0] = xs
+                x_terms = [(pi, xs * fx, fy, amp) for pi, fx, fy, amp in terms]
+                self._np_layers.append((ys, verts, x_terms, color, width))
+
+        # Baked wave strips, per layer: one per detail phase step
+        self.baked = baked
+        self.phase_steps = phase_steps
+        self._strips = [
+            [None] * (phase_steps if len(terms) > 1 else 1)
+            for *_, terms in self.WAVE_LAYERS
+        ]
+
+        # Wave rows/vertex runs and sparkles for each RiverMask drawn with
+        self._wave_plans = {}
+        self._mask_sparkles = {}
+
         # Deterministic sparkle positions
         rng = random.Random(123)
         self.sparkles = [
@@ -156,70 +241,293 @@ class WaterRenderer:
                 "phase": rng2.uniform(0, 6.28),
             })
 
-    def draw(self, screen, dt, time, camera_y=0):
+    def _init_shader(self, scale, flow):
+        """Precompute the pixel grid of the shader backend's internal buffer."""
+        lw = max(1, int(self.w * scale))
+        lh = max(1, int(self.h * scale))
+        self._shader_low = pygame.Surface((lw, lh), 0, 24)
+        self._shader_full = pygame.Surface((self.w, self.h), 0, 24)
+        self._shader_rgb = np.empty((lw, lh, 3), dtype=np.uint8)
+
+        # Screen-space pixel centers, indexed [x, y] like surfarray
+        xs = (np.arange(lw, dtype=np.float32) + 0.5) * (self.w / lw)
+        ys = (np.arange(lh, dtype=np.float32) + 0.5) * (self.h / lh)
+        self._shader_x = xs[:, None]
+        self._shader_y = ys[None, :]
+
+        fx, fy = flow
+        length = math.hypot(fx, fy) or 1.0
+        self._flow = (fx / length, fy / length)
+
+        self._shader_base = np.array(self.WAVE_COLORS[0], dtype=np.float32)
+        self._shader_span = np.array((150, 205, 255), dtype=np.float32) - self._shader_base
+
+    def _shade(self, time, camera_y, sx, sy):
+        """Shade the internal buffer cells ``[sx, sy]`` for ``time``."""
+        fx, fy = self._flow
+        x = self._shader_x[sx]
+        y = self._shader_y[:, sy] + np.float32(camera_y)
+        # Along-flow and across-flow coordinates; waves travel downstream
+        u = x * fx + y * fy
+        v = y * fx - x * fy
+
+        # Layered waves: broad swells, cross ripples and fine detail
+        swell = np.sin(u * 0.018 - time * 1.1 + np.sin(v * 0.011 + time * 0.3) * 1.6)
+        ripple = np.sin(v * 0.034 + u * 0.012 - time * 0.8)
+        detail = np.sin((u + v) * 0.05 - time * 1.9)
+        waves = swell * 0.5 + ripple * 0.3 + detail * 0.2
+
+        # Caustics: bright thin filaments where two warped sines cancel out
+        c1 = np.sin(u * 0.045 - time * 1.4 + np.sin(v * 0.037 + time * 0.5) * 2.0)
+        c2 = np.sin(v * 0.052 + time * 0.9 + np.sin(u * 0.029 - time * 0.6) * 2.0)
+        caustic = np.clip(1.0 - np.abs(c1 + c2), 0.0, 1.0) ** 6
+
+        shade = np.clip(0.16 + waves * 0.12 + caustic * 0.4, 0.0, 1.0)
+        self._shader_rgb[sx, sy] = self._shader_base + shade[:, :, None] * self._shader_span
+
+    def _render_shader(self, screen, time, camera_y=0, mask=None):
+        if mask is None:
+            self._shade(time, camera_y, slice(None), slice(None))
+        else:
+            # Only shade the buffer cells under (or bordering) the mask; the
+            # rest of the buffer is never shown
+            lw, lh = self._shader_low.get_size()
+            bounds = mask.bounds
+            sx = slice(
+                max(0, bounds.left * lw // self.w - 1),
+                min(lw, -(-bounds.right * lw // self.w) + 1),
+            )
+            sy = slice(
+                max(0, bounds.top * lh // self.h - 1),
+                min(lh, -(-bounds.bottom * lh // self.h) + 1),
+            )
+            self._shade(time, camera_y, sx, sy)
+        pygame.surfarray.blit_array(self._shader_low, self._shader_rgb)
+        pygame.transform.smoothscale(self._shader_low, (self.w, self.h), self._shader_full)
+        if mask is None:
+            screen.blit(self._shader_full, (0, 0))
+        else:
+            for area in mask.rects:
+                screen.blit(self._shader_full, area, area)
+
+    def _wave_plan(self, mask):
+        """Rows of each wave layer and the vertex index ranges to draw on them.
+
+        Without a mask every row is drawn whole. With one, only rows that can
+        reach an uncovered rect are kept, cut to the vertex runs that span
+        those rects (plus a spare vertex each side for thick line ends).
+        """
+        plan = []
+        for y0, y_step, x_step, _, _ in self.WAVE_LAYERS:
+            n_verts = len(range(0, self.w + x_step, x_step))
+            rows = []
+            for y in range(y0, self.h, y_step):
+                if mask is None:
+                    rows.append((y, [(0, n_verts)]))
+                    continue
+                runs = sorted(
+                    (max(0, r.left // x_step - 1), min(n_verts, -(-r.right // x_step) + 2))
+                    for r in mask.rects
+                    if r.top - self.WAVE_REACH <= y < r.bottom + self.WAVE_REACH
+                )
+                merged = []
+                for i0, i1 in runs:
+                    if merged and i0 <= merged[-1][1]:
+                        merged[-1] = (merged[-1][0], max(merged[-1][1], i1))
+                    else:
+                        merged.append((i0, i1))
+                if merged:
+                    rows.append((y, merged))
+            plan.append(rows)
+        return plan
+
+    def _render_waves(self, screen, phases, camera_y=0, mask=None):
+        """Draw the base fill and the four wave layers for the given phases.
+
+        With a ``RiverMask`` only its rects are filled and only the wave
+        vertices that reach them are generated. Polylines are cut at whole
+        segments and drawn unclipped (the overdraw lands under the level's
+        cubes), so the visible pixels match a full render exactly.
+        """
+        plan = self._wave_plans.get(mask)
+        if plan is None:
+            plan = self._wave_plans[mask] = self._wave_plan(mask)
+
         # Deep water base
-        screen.fill((22, 52, 138))
+        if mask is None:
+            screen.fill(self.WAVE_COLORS[0])
+        else:
+            for area in mask.rects:
+                screen.fill(self.WAVE_COLORS[0], area)
+
+        if self.backend == "numpy":
+            self._render_waves_numpy(screen, phases, camera_y, plan)
+        else:
+            self._render_waves_python(screen, phases, camera_y, plan)
+
+    def _render_waves_numpy(self, screen, phases, camera_y, plan):
+        for (y0, y_step, _, _, _), rows, (ys, verts, x_terms, color, width) in zip(
+            self.WAVE_LAYERS, plan, self._np_layers
+        ):
+            if not rows or verts.shape[1] < 2:
+                continue
+            row_index = [(y - y0) // y_step for y, _ in rows]
+            # Only evaluate the vertex columns some run on these rows uses
+            c0 = min(runs[0][0] for _, runs in rows)
+            c1 = max(runs[-1][1] for _, runs in rows)
+            row_ys = ys[row_index]
+            y_world = row_ys + camera_y
+            # Same operation order as the python loop so both backends
+            # truncate to identical pixel rows
+            wy = row_ys[:, None]
+            for pi, x_arg, fy, amp in x_terms:
+                wy = wy + np.sin((x_arg[c0:c1] + phases[pi])[None, :] + (y_world * fy)[:, None]) * amp
+            layer_verts = verts[row_index, c0:c1]
+            layer_verts[:, :, 1] = wy  # float -> int64 truncates toward zero like int()
+            for pts, (_, runs) in zip(layer_verts.tolist(), rows):
+                for i0, i1 in runs:
+                    if i1 - i0 > 1:
+                        pygame.draw.lines(screen, color, False, pts[i0 - c0:i1 - c0], width)
+
+    def _render_waves_python(self, screen, phases, camera_y, plan):
+        phase1, phase2, phase3, phase3_detail, phase4 = phases
 
         # Wave layer 1: Broad gentle swells
-        phase1 = time * 0.7
-        for y in range(0, self.h, 16):
+        for y, runs in plan[0]:
             y_world = y + camera_y
-            pts = []
-            for x in range(0, self.w + 8, 8):
-                wy = y + math.sin(x * 0.009 + phase1 + y_world * 0.003) * 5
-                pts.append((x, int(wy)))
-            if len(pts) > 1:
-                pygame.draw.lines(screen, (35, 72, 175), False, pts, 3)
+            for i0, i1 in runs:
+                pts = []
+                for x in range(i0 * 8, i1 * 8, 8):
+                    wy = y + math.sin(x * 0.009 + phase1 + y_world * 0.003) * 5
+                    pts.append((x, int(wy)))
+                if len(pts) > 1:
+                    pygame.draw.lines(screen, self.WAVE_COLORS[1], False, pts, 3)
 
         # Wave layer 2: Medium ripples flowing in the opposite direction
-        phase2 = time * -0.45
-        for y in range(4, self.h, 22):
+        for y, runs in plan[1]:
             y_world = y + camera_y
-            pts = []
-            for x in range(0, self.w + 10, 10):
-                wy = y + math.sin(x * 0.014 + phase2 + y_world * 0.005) * 3.5
-                pts.append((x, int(wy)))
-            if len(pts) > 1:
-                pygame.draw.lines(screen, (48, 92, 198), False, pts, 2)
+            for i0, i1 in runs:
+                pts = []
+                for x in range(i0 * 10, i1 * 10, 10):
+                    wy = y + math.sin(x * 0.014 + phase2 + y_world * 0.005) * 3.5
+                    pts.append((x, int(wy)))
+                if len(pts) > 1:
+                    pygame.draw.lines(screen, self.WAVE_COLORS[2], False, pts, 2)
 
         # Wave layer 3: Fine shimmering detail
-        phase3 = time * 0.9
-        for y in range(8, self.h, 30):
+        for y, runs in plan[2]:
             y_world = y + camera_y
-            pts = []
-            for x in range(0, self.w + 12, 12):
-                wy = (
-                    y
-                    + math.sin(x * 0.006 + phase3 + y_world * 0.001) * 7
-                    + math.sin(x * 0.02 + phase3 * 0.6 + y_world * 0.001) * 2
-                )
-                pts.append((x, int(wy)))
-            if len(pts) > 1:
-                pygame.draw.lines(screen, (60, 112, 215), False, pts, 2)
+            for i0, i1 in runs:
+                pts = []
+                for x in range(i0 * 12, i1 * 12, 12):
+                    wy = (
+                        y
+                        + math.sin(x * 0.006 + phase3 + y_world * 0.001) * 7
+                        + math.sin(x * 0.02 + phase3_detail + y_world * 0.001) * 2
+                    )
+                    pts.append((x, int(wy)))
+                if len(pts) > 1:
+                    pygame.draw.lines(screen, self.WAVE_COLORS[3], False, pts, 2)
 
         # Wave layer 4: Highlight accent waves
-        phase4 = time * 0.35
-        for y in range(2, self.h, 38):
+        for y, runs in plan[3]:
             y_world = y + camera_y
-            pts = []
-            for x in range(0, self.w + 10, 10):
-                wy = y + math.sin(x * 0.011 + phase4 + y_world * 0.002) * 4
-                pts.append((x, int(wy)))
-            if len(pts) > 1:
-                pygame.draw.lines(screen, (72, 130, 230), False, pts, 1)
+            for i0, i1 in runs:
+                pts = []
+                for x in range(i0 * 10, i1 * 10, 10):
+                    wy = y + math.sin(x * 0.011 + phase4 + y_world * 0.002) * 4
+                    pts.append((x, int(wy)))
+                if len(pts) > 1:
+                    pygame.draw.lines(screen, self.WAVE_COLORS[4], False, pts, 1)
+
+    def _strip(self, layer, step=0):
+        """Baked strip of wave ``layer`` (at detail phase ``step``), drawn on first use."""
+        strip = self._strips[layer][step]
+        if strip is None:
+            y0, y_step, x_step, width, terms = self.WAVE_LAYERS[layer]
+            period = 2 * math.pi / terms[0][1]
+            # Only the five wave colors are ever drawn, so 8-bit palettized
+            # strips hold the lines exactly at a quarter of the memory
+            strip = pygame.Surface((self.w + math.ceil(period), self.h), 0, 8)
+            strip.set_palette(self.WAVE_COLORS)
+            strip.fill(self.WAVE_COLORS[0])
+            phases = [0.0] * len(self.PHASE_RATES)
+            if len(terms) > 1:
+                phases[terms[1][0]] = 2 * math.pi * step / self.phase_steps
+            for y in range(y0, self.h, y_step):
+                pts = []
+                for x in range(0, strip.get_width() + x_step, x_step):
+                    wy = y
+                    for pi, fx, fy, amp in terms:
+                        wy = wy + math.sin(x * fx + phases[pi] + y * fy) * amp
+                    pts.append((x, int(wy)))
+                pygame.draw.lines(strip, self.WAVE_COLORS[layer + 1], False, pts, width)
+            strip.set_colorkey(self.WAVE_COLORS[0], pygame.RLEACCEL)
+            self._strips[layer][step] = strip
+        return strip
+
+    def prebake(self):
+        """Render every baked wave strip now instead of on first use."""
+        for layer, strips in enumerate(self._strips):
+            for step in range(len(strips)):
+                self._strip(layer, step)
+
+    def _draw_baked(self, screen, time, mask):
+        """Base fill and each layer's strip at the offset for ``time``."""
+        areas = [screen.get_rect()] if mask is None else mask.rects
+        for area in areas:
+            screen.fill(self.WAVE_COLORS[0], area)
+        for layer, (*_, terms) in enumerate(self.WAVE_LAYERS):
+            pi, fx = terms[0][:2]
+            # The layer at phase p is its phase-0 strip read p / fx px further on
+            offset = int(self.PHASE_RATES[pi] * time / fx % (2 * math.pi / fx))
+            step = 0
+            if len(terms) > 1:
+                # What the shift leaves of the detail term's phase, rounded
+                # to the nearest baked step
+                pj, fx2 = terms[1][:2]
+                detail = (self.PHASE_RATES[pj] * time - fx2 * offset) % (2 * math.pi)
+                step = round(detail / (2 * math.pi) * self.phase_steps) % self.phase_steps
+            strip = self._strip(layer, step)
+            for area in areas:
+                screen.blit(strip, area, area.move(offset, 0))
+
+    def draw(self, screen, dt, time, camera_y=0, mask=None):
+        """Draw the water; with a ``RiverMask`` only its uncovered areas."""
+        # The baked strips have no vertical scroll, so they only stand in
+        # for the live waves when the camera is at rest.
+        if self.baked and camera_y == 0:
+            self._draw_baked(screen, time, mask)
+        elif self.backend == "shader":
+            self._render_shader(screen, time, camera_y, mask)
+        else:
+            phase3 = time * 0.9
+            self._render_waves(
+                screen,
+                (time * 0.7, time * -0.45, phase3, phase3 * 0.6, time * 0.35),
+                camera_y,
+                mask,
+            )
 
         # Flow particles (vertical current streaks)
         for p in self.flow_particles:
             p["y"] += p["speed"] * dt
             if p["y"] > self.h + 20:
                 p["y"] = -p["length"]
-                p["x"] = random.uniform(0, self.w)
+                if mask is None:
+                    p["x"] = random.uniform(0, self.w)
+                else:
+                    p["x"] = mask.random_column_x()
 
             brightness = 0.5 + 0.5 * math.sin(time * 1.5 + p["phase"])
             if brightness > 0.4:
                 c = int(55 + brightness * 30)
                 x_pos, y_pos = int(p["x"]), int(p["y"])
                 end_y = int(p["y"] + p["length"] * brightness)
+                if mask is not None and not (
+                    mask.contains(x_pos, y_pos) or mask.contains(x_pos, end_y)
+                ):
+                    continue
                 pygame.draw.line(
                     screen,
                     (c, min(255, c + 35), min(255, c + 75)),
@@ -229,7 +537,13 @@ class WaterRenderer:
                 )
 
         # Sparkles (twinkling sun reflections)
-        for sx, sy, ph in self.sparkles:
+        sparkles = self.sparkles
+        if mask is not None:
+            sparkles = self._mask_sparkles.get(mask)
+            if sparkles is None:
+                sparkles = [s for s in self.sparkles if mask.contains(s[0], s[1])]
+                self._mask_sparkles[mask] = sparkles
+        for sx, sy, ph in sparkles:
             b = math.sin(time * 2.8 + ph)
             if b > 0.55:
                 intensity = (b - 0.55) / 0.45
@@ -240,185 +554,175 @@ class WaterRenderer:
 
 
 # ================================================================
-# FOREST RENDERING - Pre-rendered with real tree canopy assets
+# RIVER MASK (water area left uncovered by a level's obstacles)
 # ================================================================
-def create_forest_surface(cubes, w, h, floor_tile, canopy1, canopy2, cap_trees=False):
-    """Pre-render forest with floor texture and top-down tree canopy assets."""
-    surface = pygame.Surface((w, h), pygame.SRCALPHA)
-
-    rng = random.Random(42)
-
-    for cx, cy, cw, ch in cubes:
-        # ---- Forest floor ----
-        if floor_tile:
-            tile_size = 96
-            scaled_floor = pygame.transform.scale(floor_tile, (tile_size, tile_size))
-            for tx in range(cx, cx + cw, tile_size):
-                for ty in range(cy, cy + ch, tile_size):
-                    clip_w = min(tile_size, cx + cw - tx)
-                    clip_h = min(tile_size, cy + ch - ty)
-                    if clip_w > 0 and clip_h > 0:
-                        if clip_w >= tile_size and clip_h >= tile_size:
-                            surface.blit(scaled_floor, (tx, ty))
-                        else:
-                            clipped = scaled_floor.subsurface(
-                                (0, 0, min(clip_w, tile_size), min(clip_h, tile_size))
-                            )
-                            surface.blit(clipped, (tx, ty))
-        else:
-            pygame.draw.rect(surface, (18, 40, 15), (cx, cy, cw, ch))
-
-        # ---- Dark undergrowth spots ----
-        for _ in range(max(1, int(cw * ch / 250))):
-            ux = cx + rng.randint(0, max(1, cw - 1))
-            uy = cy + rng.randint(0, max(1, ch - 1))
-            us = rng.randint(5, 12)
-            g = rng.randint(18, 40)
-            pygame.draw.circle(surface, (g - 8, g, g - 10), (ux, uy), us)
-
-        # ---- Place tree canopies from assets ----
-        available = [c for c in [canopy1, canopy2] if c is not None]
-
-        if available:
-            margin = 25
-            safe_w = max(1, cw - margin * 2)
-            safe_h = max(1, ch - margin * 2)
-            area = safe_w * safe_h
-            tree_count = max(3, int(area / 700))
-            if cap_trees:
-                tree_count = min(80, tree_count)
-
-            trees = []
-            for _ in range(tree_count):
-                tx = cx + rng.randint(margin, max(margin + 1, cw - margin))
-                ty = cy + rng.randint(margin, max(margin + 1, ch - margin))
-                size = rng.randint(50, 90)
-                rot = rng.choice([0, 90, 180, 270]) + rng.randint(-20, 20)
-                ci = rng.randint(0, len(available) - 1)
-                trees.append((tx, ty, size, rot, ci))
-
-            trees.sort(key=lambda t: t[1])
-
-            for tx, ty, size, rot, ci in trees:
-                canopy = available[ci]
-                scaled = pygame.transform.scale(canopy, (size, size))
-                rotated = pygame.transform.rotate(scaled, rot)
-
-                # Shadow (dark version, offset)
-                shadow = rotated.copy()
-                shadow.fill((0, 0, 0, 55), special_flags=pygame.BLEND_RGBA_MULT)
-                sr = shadow.get_rect(center=(tx + 5, ty + 5))
-                surface.blit(shadow, sr)
-
-                # Canopy
-                cr = rotated.get_rect(center=(tx, ty))
-                surface.blit(rotated, cr)
-        else:
-            # Fallback: procedural trees if no assets found
-            margin = 10
-            area = max(1, (cw - margin * 2) * (ch - margin * 2))
-            tree_count = max(2, int(area / 400))
-            if cap_trees:
-                tree_count = min(80, tree_count)
-
-            trees = []
-            for _ in range(tree_count):
-                tx = cx + rng.randint(margin, max(margin + 1, cw - margin))
-                ty = cy + rng.randint(margin, max(margin + 1, ch - margin))
-                sz = rng.randint(14, 24)
-                trees.append((tx, ty, sz))
-
-            trees.sort(key=lambda t: t[1])
-
-            for tx, ty, sz in trees:
-                gv = rng.randint(-15, 15)
-                pygame.draw.circle(
-                    surface, (8, 18, 6), (tx + 3, ty + 3), sz + 2
-                )
-                pygame.draw.circle(
-                    surface, (28 + gv, 85 + gv, 22 + gv), (tx, ty), sz
-                )
-                pygame.draw.circle(
-                    surface,
-                    (38 + gv, 110 + gv, 30 + gv),
-                    (tx - 1, ty - 1),
-                    int(sz * 0.75),
-                )
-                pygame.draw.circle(
-                    surface,
-                    (55 + gv, 145 + gv, 42 + gv),
-                    (tx - sz // 4, ty - sz // 4),
-                    int(sz * 0.5),
-                )
-                pygame.draw.circle(
-                    surface,
-                    (70 + gv, 170 + gv, 55 + gv),
-                    (tx - sz // 3, ty - sz // 3),
-                    int(sz * 0.28),
-                )
+class RiverMask:
+    """Screen area of a level that is not covered by its opaque cubes.
 
-    # ---- Forest edge (border where forest meets water) ----
-    for cx, cy, cw, ch in cubes:
-        pygame.draw.rect(surface, (10, 28, 8), (cx, cy, cw, ch), 3)
+    The area is split into horizontal bands with the same free x-spans
+    (the level's UniformGrid finds the cubes crossing each band);
+    ``rects`` holds one rectangle per band span, ready for clipped drawing.
+    """
 
-    return surface
+    def __init__(self, obstacles, w, h):
+        self.w, self.h = w, h
+
+        edges = sorted(
+            {0, h} | {min(h, max(0, y)) for _, cy, _, ch in obstacles.rects for y in (cy, cy + ch)}
+        )
+        self.bands = []
+        for y0, y1 in zip(edges, edges[1:]):
+            covered = sorted(
+                (max(0, cx), min(w, cx + cw))
+                for cx, cy, cw, ch in obstacles.query_rect(0, y0, w, y1 - y0)
+            )
+            spans = []
+            x = 0
+            for left, right in covered:
+                if left > x:
+                    spans.append((x, left))
+                x = max(x, right)
+            if x < w:
+                spans.append((x, w))
+            # Grow the previous band when the free spans continue unchanged
+            if self.bands and self.bands[-1][2] == spans:
+                self.bands[-1] = (self.bands[-1][0], y1, spans)
+            else:
+                self.bands.append((y0, y1, spans))
+
+        self._band_tops = [y0 for y0, _, _ in self.bands]
+        self.rects = [
+            pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+            for y0, y1, spans in self.bands
+            for x0, x1 in spans
+        ]
+        self.bounds = self.rects[0].unionall(self.rects) if self.rects else pygame.Rect(0, 0, 0, 0)
+
+        # Columns that hold water on at least one row (flow particle spawns)
+        self.columns = []
+        for x0, x1 in sorted(s for _, _, spans in self.bands for s in spans):
+            if self.columns and x0 <= self.columns[-1][1]:
+                self.columns[-1] = (self.columns[-1][0], max(self.columns[-1][1], x1))
+            else:
+                self.columns.append((x0, x1))
+        self._columns_width = sum(x1 - x0 for x0, x1 in self.columns)
+
+    def contains(self, x, y):
+        if y < 0 or y >= self.h:
+            return False
+        spans = self.bands[bisect.bisect_right(self._band_tops, y) - 1][2]
+        for x0, x1 in spans:
+            if x0 <= x < x1:
+                return True
+        return False
+
+    def random_column_x(self):
+        """Random x position inside a water column."""
+        offset = random.uniform(0, self._columns_width)
+        for x0, x1 in self.columns:
+            if offset <= x1 - x0:
+                return x0 + offset
+            offset -= x1 - x0
+        return random.uniform(0, self.w)
 
 
 # ================================================================
-# ROCK RENDERING - Pre-rendered stone obstacles
+# STATIC LAYER (a level's non-animated layers composited once)
 # ================================================================
-def create_rock_surface(cubes, w, h):
-    """Pre-render rock obstacles as gray/brown stone shapes."""
-    surface = pygame.Surface((w, h), pygame.SRCALPHA)
-    rng = random.Random(314)
-
-    for cx, cy, cw, ch in cubes:
-        # Base rock fill
-        pygame.draw.rect(surface, (85, 78, 68), (cx, cy, cw, ch))
-
-        # Irregular stone texture
-        num_stones = max(3, int(cw * ch / 500))
-        for _ in range(num_stones):
-            sx = cx + rng.randint(2, max(3, cw - 2))
-            sy = cy + rng.randint(2, max(3, ch - 2))
-            stone_size = rng.randint(6, 18)
-            num_verts = rng.randint(5, 8)
-            points = []
-            for i in range(num_verts):
-                ang = (i / num_verts) * math.pi * 2
-                r = stone_size * rng.uniform(0.5, 1.0)
-                px = max(cx, min(cx + cw, sx + math.cos(ang) * r))
-                py = max(cy, min(cy + ch, sy + math.sin(ang) * r))
-                points.append((int(px), int(py)))
-            if len(points) >= 3:
-                gray = rng.randint(55, 125)
-                brown = rng.randint(0, 20)
-                color = (min(255, gray + brown), min(255, gray + brown // 2), max(0, gray - brown // 2))
-                pygame.draw.polygon(surface, color, points)
-                highlight = tuple(min(255, c + 25) for c in color)
-                pygame.draw.polygon(surface, highlight, points, 1)
-
-        # Crack lines
-        for _ in range(max(1, int(cw * ch / 1500))):
-            lx1 = cx + rng.randint(3, max(4, cw - 3))
-            ly1 = cy + rng.randint(3, max(4, ch - 3))
-            lx2 = max(cx, min(cx + cw, lx1 + rng.randint(-25, 25)))
-            ly2 = max(cy, min(cy + ch, ly1 + rng.randint(-25, 25)))
-            pygame.draw.line(surface, (45, 40, 35), (lx1, ly1), (lx2, ly2), 1)
-
-        # Dark border
-        pygame.draw.rect(surface, (40, 35, 30), (cx, cy, cw, ch), 2)
-
-    return surface
+class StaticLayer:
+    """A level's non-animated layers merged and cut into cheap blits.
+
+    The layers (plus anything ``draw`` paints on top) are composited once,
+    cut into tile rows, and each run of same-kind tiles is trimmed to its
+    content and stored in display format with the cheapest blit for its
+    pixels: fully opaque runs are plain copies, runs of only clear/opaque
+    pixels use an RLE colorkey, and only soft-edged runs keep per-pixel
+    alpha (premultiplied). Empty tiles are skipped.
+
+    ``staged`` builds the same layer a tile row at a time.
+    """
+
+    TILE = 32
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, w, h, layers=(), draw=None):
+        for _ in self._build(w, h, layers, draw):
+            pass
+
+    @classmethod
+    def staged(cls, w, h, layers=(), draw=None):
+        """Generator building the layer, yielding after each step; returns it."""
+        layer = cls.__new__(cls)
+        yield from layer._build(w, h, layers, draw)
+        return layer
+
+    def _build(self, w, h, layers, draw):
+        composite = pygame.Surface((w, h), pygame.SRCALPHA)
+        for layer in layers:
+            composite.blit(layer, (0, 0))
+        if draw is not None:
+            draw(composite)
+
+        self.blits = []
+        for y in range(0, h, self.TILE):
+            yield
+            th = min(self.TILE, h - y)
+            run_kind = None
+            run_x = 0
+            for x in range(0, w + self.TILE, self.TILE):
+                kind = None
+                if x < w:
+                    kind = self._classify(composite.subsurface((x, y, min(self.TILE, w - x), th)))
+                if kind != run_kind:
+                    if run_kind not in (None, "empty"):
+                        self._add_run(composite, pygame.Rect(run_x, y, x - run_x, th), run_kind)
+                    run_kind = kind
+                    run_x = x
+
+    @staticmethod
+    def _classify(tile):
+        visible = pygame.mask.from_surface(tile, 0).count()
+        if visible == 0:
+            return "empty"
+        solid = pygame.mask.from_surface(tile, 254).count()
+        if solid == tile.get_width() * tile.get_height():
+            return "opaque"
+        return "keyed" if solid == visible else "alpha"
+
+    def _add_run(self, composite, rect, kind):
+        rect = rect.clip(composite.get_rect())
+        piece = composite.subsurface(rect)
+        trim = piece.get_bounding_rect()
+        piece = piece.subsurface(trim)
+        pos = (rect.x + trim.x, rect.y + trim.y)
+        if kind == "keyed":
+            key_mask = pygame.mask.from_threshold(piece, self.COLORKEY + (255,), (1, 1, 1, 1))
+            if key_mask.count():
+                kind = "alpha"  # the key color is in use
+        if kind == "opaque":
+            self.blits.append((piece.convert(), pos, None, 0))
+        elif kind == "keyed":
+            surf = pygame.Surface(piece.get_size())
+            surf.fill(self.COLORKEY)
+            surf.blit(piece, (0, 0))
+            surf = surf.convert()
+            surf.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+            self.blits.append((surf, pos, None, 0))
+        else:
+            surf = piece.convert_alpha().premul_alpha()
+            self.blits.append((surf, pos, None, pygame.BLEND_PREMULTIPLIED))
+
+    def draw(self, screen):
+        screen.blits(self.blits, doreturn=False)
 
 
 # ================================================================
 # SHORELINE FOAM (animated dots at water-forest boundary)
 # ================================================================
-def precompute_foam(cubes, w, h):
+def precompute_foam(obstacles, w, h):
     pts = []
     rng = random.Random(789)
-    for cx, cy, cw, ch in cubes:
+    for cx, cy, cw, ch in obstacles.rects:
         # Top edge
         for x in range(cx, cx + cw, 10):
             if 0 <= cy - 4 <= h:
@@ -435,7 +739,11 @@ def precompute_foam(cubes, w, h):
         for y in range(cy, cy + ch, 10):
             if 0 <= cx + cw + 4 <= w:
                 pts.append((cx + cw + 4, y, rng.uniform(0, 6.28)))
-    return [(x, y, p) for x, y, p in pts if 0 <= x <= w and 0 <= y <= h]
+    # Drop points that land under another (opaque) cube and are never seen
+    return [
+        (x, y, p) for x, y, p in pts
+        if 0 <= x <= w and 0 <= y <= h and not obstacles.query_point(x, y)
+    ]
 
 
 def draw_foam(screen, foam_pts, time, camera_y=0):
@@ -501,27 +809,30 @@ class OarAnimator:
 # ================================================================
 # BOAT RENDERING (hull + deck + animated oars)
 # ================================================================
-def draw_boat(surface, pos, angle, oar_anim, speed=0):
-    """Draw a detailed top-down boat with animated oar ramps."""
+# Hull outline (outer shell), also the boat's collision shape
+BOAT_HULL = [
+    pygame.Vector2(0, -22),
+    pygame.Vector2(4, -18),
+    pygame.Vector2(8, -10),
+    pygame.Vector2(10, 0),
+    pygame.Vector2(10, 10),
+    pygame.Vector2(8, 18),
+    pygame.Vector2(4, 20),
+    pygame.Vector2(0, 21),
+    pygame.Vector2(-4, 20),
+    pygame.Vector2(-8, 18),
+    pygame.Vector2(-10, 10),
+    pygame.Vector2(-10, 0),
+    pygame.Vector2(-8, -10),
+    pygame.Vector2(-4, -18),
+]
+
+
+def _draw_boat_body(surface, pos, angle):
+    """Shadow, hull, deck, planks and bow: everything but the oars."""
 
     # ---- Hull (outer shell) ----
-    hull = [
-        pygame.Vector2(0, -22),
-        pygame.Vector2(4, -18),
-        pygame.Vector2(8, -10),
-        pygame.Vector2(10, 0),
-        pygame.Vector2(10, 10),
-        pygame.Vector2(8, 18),
-        pygame.Vector2(4, 20),
-        pygame.Vector2(0, 21),
-        pygame.Vector2(-4, 20),
-        pygame.Vector2(-8, 18),
-        pygame.Vector2(-10, 10),
-        pygame.Vector2(-10, 0),
-        pygame.Vector2(-8, -10),
-        pygame.Vector2(-4, -18),
-    ]
-    rot_hull = [pos + p.rotate(angle) for p in hull]
+    rot_hull = [pos + p.rotate(angle) for p in BOAT_HULL]
 
     # Shadow under boat
     shadow_off = pygame.Vector2(3, 3)
@@ -575,6 +886,58 @@ def draw_boat(surface, pos, angle, oar_anim, speed=0):
     pygame.draw.circle(surface, (90, 55, 18), (int(bow.x), int(bow.y)), 3)
     pygame.draw.circle(surface, (145, 100, 42), (int(bow.x), int(bow.y)), 2)
 
+
+class BoatSprites:
+    """The boat body (see _draw_boat_body) pre-rotated every ``step`` degrees.
+
+    Each colorkeyed sprite is drawn the first time the boat faces that way,
+    so a whole turn costs 360 / ``step`` small bakes once and afterwards
+    the body is one blit. ``snap`` gives the angle a sprite was drawn at.
+    """
+
+    COLORKEY = (255, 0, 255)
+    HALF = 28  # the bow knob reaches 25 px from the centre, plus the shadow
+
+    def __init__(self, step=2):
+        self.count = max(1, round(360 / step))
+        self._sprites = [None] * self.count
+
+    def _index(self, angle):
+        return int(round(angle * self.count / 360)) % self.count
+
+    def snap(self, angle):
+        return self._index(angle) * 360 / self.count
+
+    def get(self, angle):
+        index = self._index(angle)
+        sprite = self._sprites[index]
+        if sprite is None:
+            size = 2 * self.HALF + 1
+            sprite = pygame.Surface((size, size))
+            sprite.fill(self.COLORKEY)
+            _draw_boat_body(sprite, pygame.Vector2(self.HALF, self.HALF), index * 360 / self.count)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+            self._sprites[index] = sprite
+        return sprite
+
+
+def draw_boat(surface, pos, angle, oar_anim, speed=0):
+    """Draw a detailed top-down boat with animated oar ramps.
+
+    The body comes from ``boat_sprites`` when the cache is on; the oars
+    and their splash are always drawn live, from the same whole pixel and
+    snapped angle as the body so they stay attached to it.
+    """
+    if boat_sprites is not None:
+        pos = pygame.Vector2(round(pos.x), round(pos.y))
+        angle = boat_sprites.snap(angle)
+        half = BoatSprites.HALF
+        surface.blit(boat_sprites.get(angle), (int(pos.x) - half, int(pos.y) - half))
+    else:
+        _draw_boat_body(surface, pos, angle)
+
     # ---- OARS (Ramps) ----
     for side in ("left", "right"):
         if side == "left":
@@ -691,66 +1054,236 @@ class WakeSystem:
 # PARTICLE SYSTEM (for splash effects)
 # ================================================================
 class ParticleSystem:
-    """General purpose particle system with gravity and fading."""
-
-    def __init__(self):
-        # Each particle: [x, y, vx, vy, life, max_life, color, size]
-        self.particles = []
+    """General purpose particle system with gravity and fading.
+
+    Particles live in fixed-capacity NumPy arrays, one per field, with the
+    live ones packed at the front: update advances them all at once and
+    fills the slots of dead ones from the tail, and draw stamps every disc
+    straight into the surface's pixels. Emits past ``capacity`` are
+    dropped. Without NumPy the system stays empty (particles are cosmetic).
+    """
+
+    GRAVITY = 150
+    MAX_RADIUS = 4
+    # Pixel offsets of a filled disc of each drawn radius
+    DISC_OFFSETS = {}
+
+    def __init__(self, capacity=20000):
+        self.capacity = capacity
+        self.count = 0
+        if not NUMPY_AVAILABLE:
+            return
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self._fields = (self.x, self.y, self.vx, self.vy, self.life,
+                        self.max_life, self.size, self.color)
+        if not ParticleSystem.DISC_OFFSETS:
+            for r in range(1, self.MAX_RADIUS + 1):
+                dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+                inside = dx * dx + dy * dy <= r * r
+                ParticleSystem.DISC_OFFSETS[r] = (dx[inside], dy[inside])
 
     def emit_splash(self, x, y, count):
-        for _ in range(count):
-            angle = random.uniform(0, math.pi * 2)
-            speed = random.uniform(30, 120)
-            vx = math.cos(angle) * speed
-            vy = math.sin(angle) * speed
-            life = random.uniform(0.3, 0.8)
-            color = (
-                random.randint(150, 220),
-                random.randint(200, 240),
-                255,
-            )
-            size = random.uniform(1.5, 4.0)
-            self.particles.append([x, y, vx, vy, life, life, color, size])
+        if not NUMPY_AVAILABLE:
+            return
+        count = min(count, self.capacity - self.count)
+        if count <= 0:
+            return
+        s = slice(self.count, self.count + count)
+        angle = np.random.uniform(0, math.pi * 2, count)
+        speed = np.random.uniform(30, 120, count)
+        self.x[s] = x
+        self.y[s] = y
+        self.vx[s] = np.cos(angle) * speed
+        self.vy[s] = np.sin(angle) * speed
+        self.life[s] = np.random.uniform(0.3, 0.8, count)
+        self.max_life[s] = self.life[s]
+        self.color[s, 0] = np.random.randint(150, 221, count)
+        self.color[s, 1] = np.random.randint(200, 241, count)
+        self.color[s, 2] = 255
+        self.size[s] = np.random.uniform(1.5, 4.0, count)
+        self.count += count
 
     def update(self, dt):
-        alive = []
-        for p in self.particles:
-            p[4] -= dt  # life
-            if p[4] <= 0:
-                continue
-            p[3] += 150 * dt  # gravity on vy
-            p[0] += p[2] * dt  # x += vx*dt
-            p[1] += p[3] * dt  # y += vy*dt
-            alive.append(p)
-        self.particles = alive
+        n = self.count
+        if n == 0:
+            return
+        life = self.life[:n]
+        life -= dt
+        alive = life > 0
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            # Swap-remove: the live particles past the new end move into
+            # the dead slots before it
+            holes = np.flatnonzero(~alive[:kept])
+            movers = np.flatnonzero(alive[kept:]) + kept
+            for field in self._fields:
+                field[holes] = field[movers]
+            self.count = n = kept
+        vy = self.vy[:n]
+        vy += self.GRAVITY * dt
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += vy * dt
+
+    def clear(self):
+        self.count = 0
 
     def draw(self, screen, camera_y=0):
-        for p in self.particles:
-            x, y, vx, vy, life, max_life, color, size = p
-            sy = y - camera_y
-            if sy < -20 or sy > HEIGHT + 20:
-                continue
-            alpha_ratio = max(0, life / max_life)
-            r = min(255, int(color[0] * alpha_ratio))
-            g = min(255, int(color[1] * alpha_ratio))
-            b = min(255, int(color[2] * alpha_ratio))
-            sz = max(1, int(size * alpha_ratio))
-            pygame.draw.circle(screen, (r, g, b), (int(x), int(sy)), sz)
+        n = self.count
+        if n == 0:
+            return
+        sy = self.y[:n] - camera_y
+        visible = np.flatnonzero((sy >= -20) & (sy <= HEIGHT + 20))
+        if len(visible) == 0:
+            return
+        ratio = np.maximum(self.life[visible] / self.max_life[visible], 0)
+        colors = np.minimum(self.color[visible] * ratio[:, None], 255).astype(np.uint8)
+        radius = np.maximum((self.size[visible] * ratio).astype(np.int32), 1)
+        xs = self.x[visible].astype(np.int32)
+        ys = sy[visible].astype(np.int32)
+        w, h = screen.get_size()
+        pixels = pygame.surfarray.pixels3d(screen)
+        try:
+            for r, (dx, dy) in self.DISC_OFFSETS.items():
+                pick = np.flatnonzero(radius == r)
+                if len(pick) == 0:
+                    continue
+                px = (xs[pick, None] + dx).ravel()
+                py = (ys[pick, None] + dy).ravel()
+                rgb = np.repeat(colors[pick], len(dx), axis=0)
+                inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+                pixels[px[inside], py[inside]] = rgb[inside]
+        finally:
+            del pixels
 
 
 # ================================================================
 # CRASH ANIMATION
 # ================================================================
+class CrashLibrary:
+    """Crash effects (wood debris + splash rings) baked once at startup.
+
+    Each of ``variants`` seeded crashes is simulated at FPS up front, and
+    every frame is kept as a list of ``(sprite, dx, dy)``: small colorkeyed
+    sprites (a faded debris disc, a splash ring) placed relative to the
+    crash point. Sprites are shared between frames and variants, so the
+    whole library stays small.
+    """
+
+    FPS = 60
+    DURATION = 1.2
+    COLORKEY = (255, 0, 255)
+    FADE_STEPS = 16  # debris fade levels (sprites are shared per level)
+    DEBRIS_COLORS = [
+        (139, 69, 19), (110, 68, 28), (155, 105, 50),
+        (100, 65, 22), (125, 80, 32), (75, 45, 15)
+    ]
+
+    def __init__(self, variants=8, seed=4242):
+        self._sprites = {}
+        rng = random.Random(seed)
+        self.frame_count = int(round(self.DURATION * self.FPS))
+        rings = self._bake_rings()
+        self.sequences = [self._bake_crash(rng, rings) for _ in range(variants)]
+
+    def _sprite(self, color, radius, width=0):
+        """Colorkeyed circle, centred in a (2 * radius + 1)^2 sprite."""
+        key = (color, radius, width)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            size = 2 * radius + 1
+            sprite = pygame.Surface((size, size))
+            sprite.fill(self.COLORKEY)
+            pygame.draw.circle(sprite, color, (radius, radius), radius, width)
+            if pygame.display.get_surface() is not None:
+                sprite = sprite.convert()
+            sprite.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return sprite
+
+    def _bake_rings(self):
+        """Splash ring sprites per frame (the same for every crash)."""
+        dt = 1 / self.FPS
+        rings = [
+            {"radius": 5.0, "max_radius": 35 + i * 18, "delay": i * 0.12,
+             "life": 0.7, "max_life": 0.7}
+            for i in range(3)
+        ]
+        frames = []
+        for _ in range(self.frame_count):
+            frame = []
+            for ring in rings:
+                if ring["delay"] > 0:
+                    ring["delay"] -= dt
+                    continue
+                ring["life"] -= dt
+                ring["radius"] += ring["max_radius"] / ring["max_life"] * dt
+                if ring["life"] <= 0:
+                    continue
+                alpha = ring["life"] / ring["max_life"]
+                r = int(ring["radius"])
+                bright = int(180 * alpha)
+                c = (min(255, 100 + bright), min(255, 150 + bright // 2), 255)
+                if r > 1:
+                    frame.append((self._sprite(c, r, max(1, int(3 * alpha))), -r, -r))
+            frames.append(frame)
+        return frames
+
+    def _bake_crash(self, rng, rings):
+        dt = 1 / self.FPS
+        debris = []
+        for _ in range(rng.randint(14, 20)):
+            ang = rng.uniform(0, math.pi * 2)
+            spd = rng.uniform(80, 220)
+            life = rng.uniform(0.5, 1.1)
+            color = rng.choice(self.DEBRIS_COLORS)
+            debris.append([0.0, 0.0, math.cos(ang) * spd, math.sin(ang) * spd,
+                           rng.uniform(3, 7), color, life, life])
+        frames = []
+        for ring_sprites in rings:
+            frame = list(ring_sprites)
+            alive = []
+            for d in debris:
+                d[6] -= dt
+                if d[6] <= 0:
+                    continue
+                d[3] += 250 * dt  # gravity
+                d[0] += d[2] * dt
+                d[1] += d[3] * dt
+                alive.append(d)
+            debris = alive
+            for x, y, vx, vy, size, color, life, max_life in debris:
+                # Fade snapped to FADE_STEPS levels so sprites are shared
+                alpha = math.ceil(life / max_life * self.FADE_STEPS) / self.FADE_STEPS
+                c = tuple(max(0, int(v * alpha)) for v in color)
+                sz = max(1, int(size * alpha))
+                frame.append((self._sprite(c, sz), int(x) - sz, int(y) - sz))
+            frames.append(frame)
+        return frames
+
+    def pick(self):
+        return random.choice(self.sequences)
+
+
 class CrashAnimation:
-    """Boat crash: debris particles + splash rings + callback on complete."""
+    """Boat crash: debris particles + splash rings + callback on complete.
 
-    def __init__(self):
+    Plays a baked CrashLibrary sequence by frame index.
+    """
+
+    def __init__(self, library):
+        self.library = library
         self.active = False
         self.timer = 0
-        self.duration = 1.2
+        self.duration = library.DURATION
         self.crash_pos = pygame.Vector2(0, 0)
-        self.debris = []
-        self.splash_rings = []
+        self.sequence = None
         self.on_complete = None
 
     def trigger(self, pos, angle, on_complete):
@@ -758,52 +1291,12 @@ class CrashAnimation:
         self.timer = 0
         self.crash_pos = pygame.Vector2(pos.x, pos.y)
         self.on_complete = on_complete
-        # Wood debris
-        self.debris = []
-        for _ in range(random.randint(14, 20)):
-            ang = random.uniform(0, math.pi * 2)
-            spd = random.uniform(80, 220)
-            life = random.uniform(0.5, 1.1)
-            color = random.choice([
-                (139, 69, 19), (110, 68, 28), (155, 105, 50),
-                (100, 65, 22), (125, 80, 32), (75, 45, 15)
-            ])
-            self.debris.append([
-                pos.x, pos.y,
-                math.cos(ang) * spd, math.sin(ang) * spd,
-                random.uniform(3, 7), color, life, life
-            ])
-        # Splash rings
-        self.splash_rings = []
-        for i in range(3):
-            self.splash_rings.append({
-                "x": pos.x, "y": pos.y,
-                "radius": 5.0, "max_radius": 35 + i * 18,
-                "delay": i * 0.12, "life": 0.7, "max_life": 0.7
-            })
+        self.sequence = self.library.pick()
 
     def update(self, dt):
         if not self.active:
             return
         self.timer += dt
-        # Debris
-        alive = []
-        for d in self.debris:
-            d[6] -= dt
-            if d[6] <= 0:
-                continue
-            d[3] += 250 * dt  # gravity
-            d[0] += d[2] * dt
-            d[1] += d[3] * dt
-            alive.append(d)
-        self.debris = alive
-        # Splash rings
-        for ring in self.splash_rings:
-            if ring["delay"] > 0:
-                ring["delay"] -= dt
-                continue
-            ring["life"] -= dt
-            ring["radius"] += ring["max_radius"] / ring["max_life"] * dt
         # Done?
         if self.timer >= self.duration:
             self.active = False
@@ -813,79 +1306,212 @@ class CrashAnimation:
     def draw(self, screen, camera_y=0):
         if not self.active:
             return
-        for ring in self.splash_rings:
-            if ring["delay"] > 0 or ring["life"] <= 0:
-                continue
-            alpha = max(0, ring["life"] / ring["max_life"])
-            r = int(ring["radius"])
-            sy = ring["y"] - camera_y
-            bright = int(180 * alpha)
-            c = (min(255, 100 + bright), min(255, 150 + bright // 2), 255)
-            if r > 1:
-                pygame.draw.circle(screen, c, (int(ring["x"]), int(sy)), r, max(1, int(3 * alpha)))
-        for d in self.debris:
-            x, y, vx, vy, size, color, life, max_life = d
-            sy = y - camera_y
-            if sy < -20 or sy > HEIGHT + 20:
-                continue
-            alpha = max(0, life / max_life)
-            c = tuple(max(0, int(v * alpha)) for v in color)
-            sz = max(1, int(size * alpha))
-            pygame.draw.circle(screen, c, (int(x), int(sy)), sz)
+        # Frame i shows the crash (i + 1) / FPS seconds in
+        index = int(self.timer * self.library.FPS + 0.5) - 1
+        frame = self.sequence[min(max(index, 0), len(self.sequence) - 1)]
+        ox = int(self.crash_pos.x)
+        oy = int(self.crash_pos.y - camera_y)
+        screen.blits([(sprite, (ox + dx, oy + dy)) for sprite, dx, dy in frame], doreturn=False)
 
 
 # ================================================================
 # FISH SYSTEM (small fish swimming in the river)
 # ================================================================
 class FishSystem:
-    """Small ambient fish swimming horizontally in the river."""
-
-    def __init__(self, map_height):
-        self.fish = []
-        rng = random.Random(999)
-        for _ in range(25):
-            x = rng.uniform(220, WIDTH - 220)
-            y = rng.uniform(100, map_height - 100)
-            vx = rng.choice([-1, 1]) * rng.uniform(20, 60)
-            size = rng.randint(4, 8)
-            r = rng.randint(140, 200)
-            g = rng.randint(160, 220)
-            b = rng.randint(60, 120)
-            self.fish.append({
-                "x": x, "y": y, "vx": vx, "size": size,
-                "color": (r, g, b),
-            })
+    """Schools of small fish swimming around the river's obstacles.
+
+    State lives in NumPy arrays and every update is a handful of array
+    operations: fish are binned into a uniform grid of NEIGHBOUR_CELL
+    cells, and each fish steers with the per-cell sums of its 3x3 block
+    of cells (cohesion, alignment) and of its own cell (separation). The
+    level's DistanceField keeps fish off the banks and rocks, and its
+    FlowField (scaled by ``current``, px/s) carries them downstream. Fish are
+    drawn with one blits call from sprites pre-rendered per size, colour
+    and heading bucket. Without NumPy there are no fish (they are
+    decoration).
+    """
+
+    NEIGHBOUR_CELL = 48
+    HEADINGS = 16
+    SIZES = (4, 5, 6, 7, 8)
+    COLORS = [(150, 180, 80), (170, 200, 100), (190, 210, 90), (160, 170, 110)]
+    MIN_SPEED = 20
+    MAX_SPEED = 60
+    COHESION = 0.4
+    ALIGNMENT = 0.8
+    SEPARATION = 3.0
+    AVOID_MARGIN = 30
+    AVOID = 400.0
+    WANDER = 30.0
+
+    def __init__(self, field, count=60, seed=999, flow=None, current=0):
+        self.count = 0
+        if not NUMPY_AVAILABLE:
+            return
+        self.w, self.h = field.w, field.h
+        self.flow = flow if current else None
+        self.current = current
+        rng = np.random.default_rng(seed)
+        self.rng = rng
+
+        # Distance and its (downhill-away) gradient at the field's samples
+        self.field = field
+        self.field_cell = field.cell
+        dist = np.frombuffer(field.values, dtype=np.float32).reshape(field.rows, field.cols)
+        gy, gx = np.gradient(dist.astype(np.float64))
+        norm = np.maximum(np.hypot(gx, gy), 1e-9)
+        self.dist = dist
+        self.away_x = gx / norm
+        self.away_y = gy / norm
+
+        # Spawn in open water only
+        rows, cols = np.nonzero(dist > self.AVOID_MARGIN)
+        if len(rows) == 0:
+            return
+        pick = rng.integers(0, len(rows), count)
+        self.x = cols[pick] * float(field.cell)
+        self.y = rows[pick] * float(field.cell)
+        heading = rng.uniform(0, 2 * math.pi, count)
+        speed = rng.uniform(self.MIN_SPEED, self.MAX_SPEED, count)
+        self.vx = np.cos(heading) * speed
+        self.vy = np.sin(heading) * speed
+        self.kind = rng.integers(0, len(self.SIZES) * len(self.COLORS), count)
+        self.count = count
+
+        self.grid_w = math.ceil(self.w / self.NEIGHBOUR_CELL)
+        self.grid_h = math.ceil(self.h / self.NEIGHBOUR_CELL)
+        # Per-cell sums of (1, x, y, vx, vy), with a zero border
+        self._cells = np.zeros((5, self.grid_h + 2, self.grid_w + 2))
+        self._bake_sprites()
+
+    def _bake_sprites(self):
+        """Sprite and its centre offset per (size, colour, heading bucket)."""
+        self.sprites = []
+        offsets = []
+        for size in self.SIZES:
+            for color in self.COLORS:
+                base = pygame.Surface((size * 4 + 2, size + 2), pygame.SRCALPHA)
+                cx, cy = size * 2 + 1, size // 2 + 1
+                # Body ellipse, facing right, with the tail behind it
+                pygame.draw.ellipse(base, color, (cx - size, cy - size // 2, size * 2, size))
+                tail_x = cx - size
+                pygame.draw.polygon(base, color, [
+                    (tail_x, cy),
+                    (tail_x - size, cy - size // 2),
+                    (tail_x - size, cy + size // 2),
+                ])
+                for bucket in range(self.HEADINGS):
+                    angle = -bucket * 360 / self.HEADINGS  # y points down
+                    sprite = pygame.transform.rotate(base, angle)
+                    if pygame.display.get_surface() is not None:
+                        sprite = sprite.convert_alpha()
+                    self.sprites.append(sprite)
+                    offsets.append((sprite.get_width() // 2, sprite.get_height() // 2))
+        offsets = np.array(offsets)
+        self.off_x = offsets[:, 0]
+        self.off_y = offsets[:, 1]
+
+    def _neighbour_sums(self, cell, channels):
+        """Per-fish sums of each channel over its own cell and 3x3 block."""
+        gw, gh = self.grid_w, self.grid_h
+        grid = self._cells
+        for k, values in enumerate(channels):
+            grid[k, 1:-1, 1:-1] = np.bincount(cell, values, minlength=gw * gh).reshape(gh, gw)
+        block = (
+            grid[:, :-2, :-2] + grid[:, :-2, 1:-1] + grid[:, :-2, 2:]
+            + grid[:, 1:-1, :-2] + grid[:, 1:-1, 1:-1] + grid[:, 1:-1, 2:]
+            + grid[:, 2:, :-2] + grid[:, 2:, 1:-1] + grid[:, 2:, 2:]
+        ).reshape(len(channels), -1)
+        return grid[:, 1:-1, 1:-1].reshape(len(channels), -1)[:, cell], block[:, cell]
 
     def update(self, dt):
-        for f in self.fish:
-            f["x"] += f["vx"] * dt
-            # Bounce off river walls
-            if f["x"] < 220:
-                f["x"] = 220
-                f["vx"] = abs(f["vx"])
-            elif f["x"] > WIDTH - 220:
-                f["x"] = WIDTH - 220
-                f["vx"] = -abs(f["vx"])
+        n = self.count
+        if n == 0:
+            return
+        x, y, vx, vy = self.x, self.y, self.vx, self.vy
+        c = self.NEIGHBOUR_CELL
+        cell = (
+            np.minimum((y // c).astype(np.intp), self.grid_h - 1) * self.grid_w
+            + np.minimum((x // c).astype(np.intp), self.grid_w - 1)
+        )
+        own, block = self._neighbour_sums(cell, (None, x, y, vx, vy))
+        own_n, own_x, own_y = own[0], own[1], own[2]
+        block_n, block_x, block_y, block_vx, block_vy = block
+
+        # Neighbours exclude the fish itself
+        others = np.maximum(block_n - 1, 1)
+        has = block_n > 1
+        ax = np.where(has, ((block_x - x) / others - x) * self.COHESION
+                      + ((block_vx - vx) / others - vx) * self.ALIGNMENT, 0.0)
+        ay = np.where(has, ((block_y - y) / others - y) * self.COHESION
+                      + ((block_vy - vy) / others - vy) * self.ALIGNMENT, 0.0)
+        # Separation: away from the middle of a crowded cell
+        crowd = own_n - 1
+        ax += (x - own_x / own_n) * crowd * self.SEPARATION
+        ay += (y - own_y / own_n) * crowd * self.SEPARATION
+
+        # Obstacles: push out along the distance gradient near banks/rocks
+        col = np.clip((x / self.field_cell + 0.5).astype(np.intp), 0, self.dist.shape[1] - 1)
+        row = np.clip((y / self.field_cell + 0.5).astype(np.intp), 0, self.dist.shape[0] - 1)
+        d = self.dist[row, col]
+        push = np.clip((self.AVOID_MARGIN - d) / self.AVOID_MARGIN, 0, None) * self.AVOID
+        away_x = self.away_x[row, col]
+        away_y = self.away_y[row, col]
+        ax += away_x * push
+        ay += away_y * push
+
+        ax += self.rng.normal(0, self.WANDER, n)
+        ay += self.rng.normal(0, self.WANDER, n)
+
+        vx += ax * dt
+        vy += ay * dt
+        speed = np.maximum(np.hypot(vx, vy), 1e-9)
+        scale = np.clip(speed, self.MIN_SPEED, self.MAX_SPEED) / speed
+        vx *= scale
+        vy *= scale
+        x += vx * dt
+        y += vy * dt
+        # Drift with the river on top of their own swimming
+        if self.flow is not None:
+            drift = self.flow.sample_many(x, y)
+            x += drift[:, 0] * (self.current * dt)
+            y += drift[:, 1] * (self.current * dt)
+
+        # A fish squeezed into an obstacle by its school pops back out,
+        # no longer heading in
+        d = self.field.distances(x, y)
+        inside = np.flatnonzero(d < 1)
+        if len(inside):
+            r = np.clip((y[inside] / self.field_cell + 0.5).astype(np.intp), 0, self.dist.shape[0] - 1)
+            k = np.clip((x[inside] / self.field_cell + 0.5).astype(np.intp), 0, self.dist.shape[1] - 1)
+            depth = 1 - d[inside]
+            out_x, out_y = self.away_x[r, k], self.away_y[r, k]
+            x[inside] += out_x * depth
+            y[inside] += out_y * depth
+            into = np.minimum(vx[inside] * out_x + vy[inside] * out_y, 0)
+            vx[inside] -= out_x * into
+            vy[inside] -= out_y * into
+
+        # Stay on the map: turn back at its edges
+        for pos, vel, limit in ((x, vx, self.w), (y, vy, self.h)):
+            low = pos < 0
+            high = pos > limit
+            vel[low] = np.abs(vel[low])
+            vel[high] = -np.abs(vel[high])
+            np.clip(pos, 0, limit, out=pos)
 
     def draw(self, screen, camera_y=0):
-        for f in self.fish:
-            sy = f["y"] - camera_y
-            if sy < -20 or sy > HEIGHT + 20:
-                continue
-            sx = int(f["x"])
-            isy = int(sy)
-            sz = f["size"]
-            # Body ellipse
-            pygame.draw.ellipse(screen, f["color"],
-                                (sx - sz, isy - sz // 2, sz * 2, sz))
-            # Tail triangle
-            direction = 1 if f["vx"] > 0 else -1
-            tail_x = sx - direction * sz
-            pygame.draw.polygon(screen, f["color"], [
-                (tail_x, isy),
-                (tail_x - direction * sz, isy - sz // 2),
-                (tail_x - direction * sz, isy + sz // 2),
-            ])
+        if self.count == 0:
+            return
+        bucket = np.rint(np.arctan2(self.vy, self.vx) * (self.HEADINGS / (2 * math.pi))).astype(np.intp)
+        index = self.kind * self.HEADINGS + bucket % self.HEADINGS
+        xs = (self.x - self.off_x[index]).astype(np.intp).tolist()
+        ys = (self.y - camera_y - self.off_y[index]).astype(np.intp).tolist()
+        sprites = self.sprites
+        screen.blits(
+            [(sprites[i], (sx, sy)) for i, sx, sy in zip(index.tolist(), xs, ys)],
+            doreturn=False,
+        )
 
 
 # ================================================================
@@ -927,21 +1553,29 @@ class ScreenShake:
 # FADE TRANSITION
 # ================================================================
 class FadeTransition:
-    """Fade to black and back, firing a callback at peak darkness."""
+    """Fade to black and back, firing a callback at peak darkness.
+
+    With a ``ready`` check the fade holds at black ("Loading...") until it
+    returns True, so a level never starts before its assets are built.
+    """
 
     def __init__(self):
         self.active = False
         self.alpha = 0
         self.fading_in = True  # True = going to black, False = coming back
         self.callback = None
+        self.ready = None
+        self.waiting = False
         self.speed = 500  # alpha per second
         self.callback_fired = False
 
-    def start(self, callback):
+    def start(self, callback, ready=None):
         self.active = True
         self.alpha = 0
         self.fading_in = True
         self.callback = callback
+        self.ready = ready
+        self.waiting = False
         self.callback_fired = False
 
     def update(self, dt):
@@ -951,6 +1585,9 @@ class FadeTransition:
             self.alpha += self.speed * dt
             if self.alpha >= 255:
                 self.alpha = 255
+                self.waiting = self.ready is not None and not self.ready()
+                if self.waiting:
+                    return
                 if not self.callback_fired and self.callback:
                     self.callback()
                     self.callback_fired = True
@@ -968,6 +1605,9 @@ class FadeTransition:
             overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
             overlay.fill((0, 0, 0, int(min(255, max(0, self.alpha)))))
             screen.blit(overlay, (0, 0))
+        if self.waiting:
+            text = subtitle_font.render("Loading...", True, (180, 200, 220))
+            screen.blit(text, text.get_rect(center=(WIDTH // 2, HEIGHT // 2)))
 
 
 # ================================================================
@@ -1014,7 +1654,11 @@ class WindSystem:
 # RIVER CURRENT (constant downstream push for Level 2)
 # ================================================================
 class RiverCurrent:
-    """Constant downstream push, stronger at center, weaker at edges."""
+    """Constant downstream push, stronger at center, weaker at edges.
+
+    Models one straight river; the levels' currents come from their flow
+    fields (see FlowField), this only gives the water its main direction.
+    """
 
     def __init__(self, strength=30):
         self.strength = strength
@@ -1164,43 +1808,52 @@ menu_boat_angle = 0
 fade = FadeTransition()
 
 # Visual systems
-water = WaterRenderer(WIDTH, HEIGHT)
+# Blit the wave layers from baked strips instead of redrawing them every
+# frame (~1 ms instead of ~4.4 ms behind the level 1 forest). The strips are
+# 8-bit, one wave period wider than the screen, ~28 MB for the default
+# WATER_PHASE_STEPS (16 strips for layer 3, whose detail lines then sit at
+# most ~0.4 px off the live ones); the wave speeds are exact. Not with the
+# shader backend, which has no wave layers to bake.
+WATER_BAKED = True
+WATER_PHASE_STEPS = 16
+# Water backend: "python", "numpy" (vectorized, same pixels) or "shader"
+# (per-pixel surfarray pass at WATER_SHADER_SCALE resolution, upscaled)
+WATER_BACKEND = "python"
+WATER_SHADER_SCALE = 0.25
+water = WaterRenderer(
+    WIDTH, HEIGHT,
+    backend=WATER_BACKEND,
+    baked=WATER_BAKED,
+    phase_steps=WATER_PHASE_STEPS,
+    shader_scale=WATER_SHADER_SCALE,
+    flow=RiverCurrent().get_force(WIDTH / 2),
+)
 oar_anim = OarAnimator()
+# Blit the boat body from a rotation cache with this angle step (degrees)
+# instead of drawing its polygons every frame (0 = draw it live)
+BOAT_SPRITE_STEP = 2
+boat_sprites = BoatSprites(BOAT_SPRITE_STEP) if BOAT_SPRITE_STEP else None
 wake = WakeSystem()
+# Fish per level (array-backed boids; thousands stay under a few ms)
+FISH_COUNT = 60
+# River current carrying the boats and fish, px/s mid-channel (see
+# FlowField); 0 keeps the still water the levels were tuned on
+RIVER_CURRENT = 0
+
+# Forest/rock layers are loaded from disk when unchanged (.cache/layers),
+# otherwise built, in the background by LEVEL_BUILD_WORKERS processes
+# (None = one per CPU, 0 = build them in this process, blocking)
+LEVEL_LAYER_CACHE = True
+LEVEL_BUILD_WORKERS = None
 
 # Timer
 timer_seconds = 60
 
-# Boat state
+# Boat state, paddle input and physics clock (see boat_physics)
 INITIAL_BOAT_POS = pygame.Vector2(WIDTH // 2, 600)
-boat_pos = INITIAL_BOAT_POS.copy()
-boat_velocity = pygame.Vector2(0, 0)
-boat_angle = 0
-
-# Input tracking
-left_pressed = False
-right_pressed = False
-input_buffer = 0
-input_decay_time = 0.25
-
-# Physics constants
-MAX_SPEED = 10
-ROTATION_SPEED = 450
-ROTATION_STEP = 25
-BASE_ACCEL = 0.6
-ACCEL_PER_PRESS = 0.35
-BASE_FRICTION = 0.99
-SIDEWAYS_FRICTION = 0.985
-SIDEWAYS_DRIFT_MULT = 0.75
-SINGLE_KEY_ACCEL_MULT = 0.8
-SINGLE_KEY_SIDEWAYS_MULT = 0.55
-
-# Rotation state
-rotating = False
-rotation_start_angle = boat_angle
-rotation_direction = 0
-target_angle = boat_angle
-down_pressed = False
+l1_boat = BoatState(INITIAL_BOAT_POS)
+l1_controls = BoatControls()
+l1_physics = FixedTimestep()
 
 # Obstacle cubes (x, y, width, height)
 left_cube_width = 200
@@ -1216,18 +1869,26 @@ cubes = [
 
 boat_collision_radius = 15
 
-# Pre-render forest surface once at startup
-print("Pre-rendering Level 1 forest...")
-forest_surface = create_forest_surface(
-    cubes, WIDTH, HEIGHT, forest_floor, tree_canopy1, tree_canopy2
-)
-print("Level 1 forest ready.")
-
-# Pre-compute shoreline foam points
-foam_points = precompute_foam(cubes, WIDTH, HEIGHT)
+# Broadphase over the cubes (hull collision, region queries and probes)
+l1_obstacles = UniformGrid(cubes)
+
+# Static layer (forest and finish line), shoreline foam points and the
+# water area left visible by the forest (water is only drawn there); set by
+# the level's background build (see LEVEL BUILDS)
+l1_static = None
+foam_points = []
+l1_river_mask = None
+# Signed distance to the cubes (near-miss and steering lookups)
+l1_field = None
+# Hull vs visible forest pixels (see MaskCollider)
+l1_collider = None
+# River current around the cubes (see FlowField)
+l1_flow = None
+l1_fish = None
 
 # Level 1 extra systems
-l1_crash = CrashAnimation()
+crash_library = CrashLibrary()
+l1_crash = CrashAnimation(crash_library)
 l1_shake = ScreenShake()
 l1_frame = pygame.Surface((WIDTH, HEIGHT))
 l1_complete_timer = 0
@@ -1257,30 +1918,24 @@ level2_cubes = [
 # Level 2 rock obstacles (only the non-wall cubes)
 level2_rock_cubes = [c for c in level2_cubes if c[2] != 150 or c[3] != HEIGHT]
 
-# Pre-render Level 2 forest (walls only) and rocks (obstacles only)
-print("Pre-rendering Level 2...")
 level2_wall_cubes = [(0, 0, 150, HEIGHT), (WIDTH - 150, 0, 150, HEIGHT)]
-l2_forest = create_forest_surface(
-    level2_wall_cubes, WIDTH, HEIGHT, forest_floor, tree_canopy1, tree_canopy2
-)
-l2_rock_surface = create_rock_surface(level2_rock_cubes, WIDTH, HEIGHT)
-print("Level 2 ready.")
-
-l2_foam_points = precompute_foam(level2_cubes, WIDTH, HEIGHT)
+l2_obstacles = UniformGrid(level2_cubes)
+
+# Static layer (forest walls, rocks and finish line), foam and water area;
+# set by the level's background build (see LEVEL BUILDS)
+l2_static = None
+l2_foam_points = []
+l2_river_mask = None
+l2_field = None
+l2_collider = None
+l2_flow = None
+l2_fish = None
 
 # Level 2 state
-l2_boat_pos = LEVEL2_INITIAL_POS.copy()
-l2_boat_vel = pygame.Vector2(0, 0)
-l2_boat_angle = 0
+l2_boat = BoatState(LEVEL2_INITIAL_POS)
+l2_controls = BoatControls()
+l2_physics = FixedTimestep()
 l2_timer = 45
-l2_rotating = False
-l2_rotation_start_angle = 0
-l2_rotation_direction = 0
-l2_target_angle = 0
-l2_input_buffer = 0
-l2_left_pressed = False
-l2_right_pressed = False
-l2_down_pressed = False
 
 # Level 2 systems
 l2_oar = OarAnimator()
@@ -1288,7 +1943,7 @@ l2_wake = WakeSystem()
 l2_particles = ParticleSystem()
 l2_shake = ScreenShake()
 l2_wind = WindSystem()
-l2_crash = CrashAnimation()
+l2_crash = CrashAnimation(crash_library)
 l2_frame = pygame.Surface((WIDTH, HEIGHT))
 
 # Win screen
@@ -1296,70 +1951,134 @@ l2_win_blink_timer = 0
 
 
 def reset_level2():
-    global l2_boat_pos, l2_boat_vel, l2_boat_angle, l2_timer
-    global l2_rotating, l2_rotation_start_angle, l2_rotation_direction, l2_target_angle
-    global l2_input_buffer, l2_left_pressed, l2_right_pressed, l2_down_pressed
-    global l2_oar, l2_wake, l2_particles, l2_shake, l2_wind, l2_crash
-    l2_boat_pos = LEVEL2_INITIAL_POS.copy()
-    l2_boat_vel = pygame.Vector2(0, 0)
-    l2_boat_angle = 0
+    global l2_timer
+    global l2_oar, l2_wake, l2_shake, l2_wind, l2_crash
+    l2_boat.reset(LEVEL2_INITIAL_POS)
+    l2_controls.reset()
+    l2_physics.reset()
     l2_timer = 45
-    l2_rotating = False
-    l2_rotation_start_angle = 0
-    l2_rotation_direction = 0
-    l2_target_angle = 0
-    l2_input_buffer = 0
-    l2_left_pressed = False
-    l2_right_pressed = False
-    l2_down_pressed = False
     l2_oar = OarAnimator()
     l2_wake = WakeSystem()
-    l2_particles = ParticleSystem()
+    # Keep the preallocated particle pool, just empty it
+    l2_particles.clear()
     l2_shake = ScreenShake()
     l2_wind = WindSystem()
-    l2_crash = CrashAnimation()
+    l2_crash = CrashAnimation(crash_library)
+
+
+# ================================================================
+# LEVEL BUILDS - each level's assets are built in the background while
+# the menu, the previous level or a transition is running
+# ================================================================
+def draw_l1_finish_line(surf):
+    pygame.draw.line(surf, (80, 255, 120), (200, 6), (330, 6), 2)
+
+
+def draw_l2_finish_line(surf):
+    pygame.draw.line(surf, (80, 255, 120), (150, LEVEL2_FINISH_Y), (WIDTH - 150, LEVEL2_FINISH_Y), 2)
+
+
+# The distance and flow fields come from the workers with the layers; the
+# rest needs surfaces, so it runs here a step per frame (each yield) while
+# the previous level is still being played.
+def finish_level1(forest, fields):
+    global l1_static, foam_points, l1_river_mask, l1_field, l1_collider, l1_flow, l1_fish
+    l1_field, l1_flow = fields
+    l1_static = yield from StaticLayer.staged(WIDTH, HEIGHT, [forest], draw_l1_finish_line)
+    foam_points = precompute_foam(l1_obstacles, WIDTH, HEIGHT)
+    l1_river_mask = RiverMask(l1_obstacles, WIDTH, HEIGHT)
+    yield
+    l1_collider = yield from MaskCollider.staged([forest], BOAT_HULL, l1_obstacles)
+    l1_fish = FishSystem(l1_field, FISH_COUNT, seed=999, flow=l1_flow, current=RIVER_CURRENT)
+    print("Level 1 ready.")
+
+
+def finish_level2(forest, rocks, fields):
+    global l2_static, l2_foam_points, l2_river_mask, l2_field, l2_collider, l2_flow, l2_fish
+    l2_field, l2_flow = fields
+    l2_static = yield from StaticLayer.staged(WIDTH, HEIGHT, [forest, rocks], draw_l2_finish_line)
+    l2_foam_points = precompute_foam(l2_obstacles, WIDTH, HEIGHT)
+    l2_river_mask = RiverMask(l2_obstacles, WIDTH, HEIGHT)
+    yield
+    l2_collider = yield from MaskCollider.staged([forest, rocks], BOAT_HULL, l2_obstacles)
+    l2_fish = FishSystem(l2_field, FISH_COUNT, seed=998, flow=l2_flow, current=RIVER_CURRENT)
+    print("Level 2 ready.")
+
+
+layer_pool = level_builders.LayerPool(LEVEL_BUILD_WORKERS) if LEVEL_BUILD_WORKERS != 0 else None
+level_builds = [
+    level_builders.LevelBuild(
+        [
+            level_builders.forest_job(cubes, WIDTH, HEIGHT),
+            level_builders.fields_job(cubes, WIDTH, HEIGHT),
+        ],
+        finish_level1, layer_pool, LEVEL_LAYER_CACHE,
+    ),
+    level_builders.LevelBuild(
+        [
+            level_builders.forest_job(level2_wall_cubes, WIDTH, HEIGHT),
+            level_builders.rock_job(level2_rock_cubes, WIDTH, HEIGHT),
+            level_builders.fields_job(level2_cubes, WIDTH, HEIGHT),
+        ],
+        finish_level2, layer_pool, LEVEL_LAYER_CACHE,
+    ),
+]
+
+
+def level_ready(level):
+    """True once ``level`` (1-based) is built; starts its build if needed.
+
+    poll_level_builds advances the build, once per frame.
+    """
+    build = level_builds[level - 1]
+    build.start()
+    return build.ready
+
+
+def prepare_next_level(level):
+    """Start building the level after ``level`` (0 = the menu)."""
+    if level < len(level_builds):
+        level_builds[level].start()
+
+
+def poll_level_builds():
+    for build in level_builds:
+        build.poll()
 
 
 # ================================================================
 # MAIN GAME LOOP
 # ================================================================
 running = True
-last_input_time = pygame.time.get_ticks() / 1000.0
-input_this_frame = False
 game_time = 0
+# Frame cap (0 = uncapped); the boat physics ticks at a fixed rate anyway
+FRAME_RATE = 60
 
 
 def reset_game():
     """Reset all game state for a fresh start (Level 1)."""
-    global boat_pos, boat_velocity, boat_angle, rotating, input_buffer
-    global rotation_direction, target_angle, rotation_start_angle
-    global left_pressed, right_pressed, down_pressed, timer_seconds
+    global timer_seconds
     global l1_crash, l1_shake
     timer_seconds = 60
-    boat_pos = INITIAL_BOAT_POS.copy()
-    boat_velocity = pygame.Vector2(0, 0)
-    boat_angle = 0
-    rotating = False
-    rotation_direction = 0
-    target_angle = 0
-    rotation_start_angle = 0
-    input_buffer = 0
-    left_pressed = False
-    right_pressed = False
-    down_pressed = False
+    l1_boat.reset(INITIAL_BOAT_POS)
+    l1_controls.reset()
+    l1_physics.reset()
     wake.clear()
-    l1_crash = CrashAnimation()
+    l1_crash = CrashAnimation(crash_library)
     l1_shake = ScreenShake()
 
 
+# Level 1 builds while the menu is up
+prepare_next_level(0)
+
 while running:
-    dt = clock.tick(60) / 1000.0
+    dt = clock.tick(FRAME_RATE) / 1000.0
     dt = min(dt, 0.05)  # Cap dt to prevent physics explosion
-    current_time = pygame.time.get_ticks() / 1000.0
     game_time += dt
 
     # Update fade transition globally
     fade.update(dt)
+    poll_level_builds()
 
     # ============================================================
     # MENU STATE
@@ -1380,7 +2099,8 @@ while running:
                             global game_state
                             game_state = "playing"
                             reset_game()
-                        fade.start(start_game_from_key)
+                            prepare_next_level(1)
+                        fade.start(start_game_from_key, ready=lambda: level_ready(1))
 
         for btn in menu_buttons:
             if btn.update(mouse_pos, mouse_click, dt):
@@ -1390,7 +2110,8 @@ while running:
                             global game_state
                             game_state = "playing"
                             reset_game()
-                        fade.start(start_game_from_play)
+                            prepare_next_level(1)
+                        fade.start(start_game_from_play, ready=lambda: level_ready(1))
                 elif btn is btn_quit:
                     running = False
 
@@ -1426,7 +2147,7 @@ while running:
                 global game_state
                 game_state = "level2"
                 reset_level2()
-            fade.start(start_l2)
+            fade.start(start_l2, ready=lambda: level_ready(2))
         fade.draw(screen)
         pygame.display.flip()
         continue
@@ -1485,8 +2206,6 @@ while running:
     # LEVEL 2 PLAYING STATE (single-screen, rocks, wind)
     # ============================================================
     if game_state == "level2":
-        l2_input_this_frame = False
-
         # Timer countdown
         l2_timer -= dt
         if l2_timer <= 0:
@@ -1525,154 +2244,75 @@ while running:
                             fade.start(go_menu_from_l2)
                         continue
                     if event.key == pygame.K_LEFT:
-                        if not l2_left_pressed:
-                            l2_left_pressed = True
+                        if not l2_controls.left:
+                            l2_controls.left = True
                             l2_oar.trigger_left()
                             play_paddle_sound()
-                            if not l2_rotating:
-                                l2_rotation_start_angle = l2_boat_angle
-                                l2_rotation_direction = 1
-                                l2_target_angle = (l2_rotation_start_angle + ROTATION_STEP) % 360
-                                l2_rotating = True
-                            else:
-                                if l2_rotation_direction == -1:
-                                    l2_target_angle = l2_rotation_start_angle % 360
-                                    l2_rotation_direction = 0
-                        l2_input_buffer += 1
-                        last_input_time = current_time
-                        l2_input_this_frame = True
+                            l2_boat.start_turn(1)
+                        l2_controls.press()
 
                     if event.key == pygame.K_RIGHT:
-                        if not l2_right_pressed:
-                            l2_right_pressed = True
+                        if not l2_controls.right:
+                            l2_controls.right = True
                             l2_oar.trigger_right()
                             play_paddle_sound()
-                            if not l2_rotating:
-                                l2_rotation_start_angle = l2_boat_angle
-                                l2_rotation_direction = -1
-                                l2_target_angle = (l2_rotation_start_angle - ROTATION_STEP) % 360
-                                l2_rotating = True
-                            else:
-                                if l2_rotation_direction == 1:
-                                    l2_target_angle = l2_rotation_start_angle % 360
-                                    l2_rotation_direction = 0
-                        l2_input_buffer += 1
-                        last_input_time = current_time
-                        l2_input_this_frame = True
+                            l2_boat.start_turn(-1)
+                        l2_controls.press()
 
                     if event.key == pygame.K_DOWN:
-                        if not l2_down_pressed:
-                            l2_down_pressed = True
+                        if not l2_controls.down:
+                            l2_controls.down = True
                             l2_oar.trigger_left()
                             l2_oar.trigger_right()
                             play_paddle_sound()
-                            if not l2_rotating:
-                                l2_rotation_start_angle = l2_boat_angle
-                                l2_rotation_direction = 1
-                                l2_target_angle = (l2_rotation_start_angle + ROTATION_STEP) % 360
-                                l2_rotating = True
-                            else:
-                                if l2_rotation_direction == -1:
-                                    l2_target_angle = l2_rotation_start_angle % 360
-                                    l2_rotation_direction = 0
-                        last_input_time = current_time
-                        l2_input_this_frame = True
+                            l2_boat.start_turn(1)
+                        l2_controls.press(0)
 
                 if event.type == pygame.KEYUP:
                     if event.key == pygame.K_LEFT:
-                        l2_left_pressed = False
+                        l2_controls.left = False
                     if event.key == pygame.K_RIGHT:
-                        l2_right_pressed = False
+                        l2_controls.right = False
                     if event.key == pygame.K_DOWN:
-                        l2_down_pressed = False
-
-            if not l2_input_this_frame:
-                if current_time - last_input_time > input_decay_time:
-                    l2_input_buffer = 0
-                else:
-                    l2_input_buffer *= math.exp(-dt / input_decay_time)
-
-            # ---- SMOOTH ROTATION ----
-            if l2_rotating:
-                diff = (l2_target_angle - l2_boat_angle + 180) % 360 - 180
-                max_step = ROTATION_SPEED * dt
-                step = math.copysign(min(abs(diff), max_step), diff)
-                l2_boat_angle += step
-                remaining = (l2_target_angle - l2_boat_angle + 180) % 360 - 180
-                if abs(remaining) < 0.01:
-                    l2_boat_angle = l2_target_angle % 360
-                    l2_rotating = False
-                    l2_rotation_direction = 0
-            l2_boat_angle %= 360
-
-            # ---- PHYSICS ----
-            forward_dir = pygame.Vector2(0, -1).rotate(l2_boat_angle)
-
-            if l2_input_buffer > 0.01:
-                total_accel = BASE_ACCEL + ACCEL_PER_PRESS * l2_input_buffer
-                if l2_left_pressed != l2_right_pressed:
-                    total_accel *= SINGLE_KEY_ACCEL_MULT
-                l2_boat_vel += forward_dir * total_accel * dt
-
-            # Apply wind
-            l2_wind.update(dt)
-            # Wind sound
-            if l2_wind.active and l2_wind.gust_timer < dt * 2:
-                play_sound(wind_sfx, 0.5)
-            wind_force = l2_wind.get_force()
-            l2_boat_vel += wind_force * dt
-
-            l2_speed = l2_boat_vel.length()
-            if l2_speed > MAX_SPEED:
-                l2_boat_vel = (l2_boat_vel / l2_speed) * MAX_SPEED
-
-            if l2_speed > 0.01:
-                vel_dir = l2_boat_vel.normalize()
-                alignment = vel_dir.dot(forward_dir)
-                sideways_factor = abs(alignment)
-                sideways_effect = SIDEWAYS_DRIFT_MULT
-                if l2_left_pressed != l2_right_pressed:
-                    sideways_effect *= SINGLE_KEY_SIDEWAYS_MULT
-                friction_mult = (
-                    BASE_FRICTION
-                    + (1 - sideways_factor)
-                    * (SIDEWAYS_FRICTION - BASE_FRICTION)
-                    * sideways_effect
-                )
-                l2_boat_vel *= friction_mult
-            else:
-                l2_boat_vel = pygame.Vector2(0, 0)
-
-            l2_boat_pos += l2_boat_vel
-
-            # ---- COLLISION DETECTION (crash animation) ----
-            for cx, cy, cw, ch in level2_cubes:
-                if (
-                    l2_boat_pos.x - boat_collision_radius < cx + cw
-                    and l2_boat_pos.x + boat_collision_radius > cx
-                    and l2_boat_pos.y - boat_collision_radius < cy + ch
-                    and l2_boat_pos.y + boat_collision_radius > cy
-                ):
-                    if not l2_crash.active:
-                        l2_shake.trigger(6, 0.5)
-                        play_sound(crash_sfx)
-                        def l2_respawn():
-                            global l2_boat_pos, l2_boat_vel, l2_boat_angle, l2_rotating
-                            l2_boat_pos = LEVEL2_INITIAL_POS.copy()
-                            l2_boat_vel = pygame.Vector2(0, 0)
-                            l2_boat_angle = 0
-                            l2_rotating = False
-                            l2_wake.clear()
-                        l2_crash.trigger(l2_boat_pos, l2_boat_angle, l2_respawn)
-                        l2_boat_vel = pygame.Vector2(0, 0)
+                        l2_controls.down = False
+
+            # ---- PHYSICS (fixed ticks, see boat_physics) ----
+            for _ in range(l2_physics.ticks(dt)):
+                # Apply wind
+                l2_wind.update(PHYSICS_DT)
+                # Wind sound
+                if l2_wind.active and l2_wind.gust_timer < PHYSICS_DT * 2:
+                    play_sound(wind_sfx, 0.5)
+                move = boat_physics.step(l2_boat, l2_controls, PHYSICS_DT, l2_wind.get_force())
+                # The river carries the boat along on top of its own move
+                if RIVER_CURRENT:
+                    current_x, current_y = l2_flow.sample(l2_boat.pos.x, l2_boat.pos.y)
+                    move.x += current_x * RIVER_CURRENT * PHYSICS_DT
+                    move.y += current_y * RIVER_CURRENT * PHYSICS_DT
+
+                # Swept move: stop where the hull first touches the forest or a
+                # rock instead of tunneling through it on a long step
+                l2_hit = l2_collider.sweep(l2_boat.pos.x, l2_boat.pos.y, move.x, move.y, l2_boat.angle)
+                l2_boat.pos += move * (l2_hit[0] if l2_hit is not None else 1)
+
+                # Clamp boat to screen bounds
+                l2_boat.pos.x = max(boat_collision_radius, min(WIDTH - boat_collision_radius, l2_boat.pos.x))
+                l2_boat.pos.y = max(0, min(HEIGHT, l2_boat.pos.y))
+
+                # ---- COLLISION DETECTION (crash animation) ----
+                if l2_hit is not None:
+                    l2_shake.trigger(6, 0.5)
+                    play_sound(crash_sfx)
+                    def l2_respawn():
+                        l2_boat.reset(LEVEL2_INITIAL_POS)
+                        l2_wake.clear()
+                    l2_crash.trigger(l2_boat.pos, l2_boat.angle, l2_respawn)
+                    l2_boat.vel = pygame.Vector2(0, 0)
+                    l2_boat.prev_pos = l2_boat.pos.copy()
                     break
 
-            # Clamp boat to screen bounds
-            l2_boat_pos.x = max(boat_collision_radius, min(WIDTH - boat_collision_radius, l2_boat_pos.x))
-            l2_boat_pos.y = max(0, min(HEIGHT, l2_boat_pos.y))
-
             # ---- WIN CONDITION ----
-            if l2_boat_pos.y < LEVEL2_FINISH_Y and not l2_crash.active:
+            if l2_boat.pos.y < LEVEL2_FINISH_Y and not l2_crash.active:
                 if not fade.active:
                     def go_l2_win():
                         global game_state, l2_win_blink_timer
@@ -1682,15 +2322,18 @@ while running:
 
         # ---- UPDATE SYSTEMS ----
         l2_oar.update(dt)
-        l2_speed_for_draw = l2_boat_vel.length()
-        l2_wake.update(dt, l2_boat_pos, l2_boat_angle, l2_speed_for_draw)
+        l2_speed_for_draw = l2_boat.vel.length()
+        l2_draw_pos, l2_draw_angle = l2_boat.interpolated(l2_physics.alpha)
+        l2_wake.update(dt, l2_draw_pos, l2_draw_angle, l2_speed_for_draw)
         l2_particles.update(dt)
+        l2_fish.update(dt)
 
         # ---- DRAWING (to frame buffer for shake offset) ----
         frame = l2_frame
 
-        # 1. Water
-        water.draw(frame, dt, game_time)
+        # 1. Water (only where forest and rocks leave it visible)
+        water.draw(frame, dt, game_time, mask=l2_river_mask)
+        l2_fish.draw(frame)
 
         # 2. Finish line glow at y=40
         finish_glow_y = LEVEL2_FINISH_Y
@@ -1699,16 +2342,12 @@ while running:
         glow_alpha = int(60 + 80 * glow_pulse)
         glow_surf.fill((80, 255, 120, glow_alpha))
         frame.blit(glow_surf, (0, finish_glow_y - 6))
-        pygame.draw.line(frame, (80, 255, 120), (150, finish_glow_y), (WIDTH - 150, finish_glow_y), 2)
 
         # 3. Shoreline foam
         draw_foam(frame, l2_foam_points, game_time)
 
-        # 4. Forest walls
-        frame.blit(l2_forest, (0, 0))
-
-        # 5. Rock obstacles
-        frame.blit(l2_rock_surface, (0, 0))
+        # 4-5. Forest walls, rock obstacles and finish line (one static layer)
+        l2_static.draw(frame)
 
         # 6. Wake
         l2_wake.draw(frame)
@@ -1718,7 +2357,7 @@ while running:
 
         # 8. Boat (hide during crash)
         if not l2_crash.active:
-            draw_boat(frame, l2_boat_pos, l2_boat_angle, l2_oar, l2_speed_for_draw)
+            draw_boat(frame, l2_draw_pos, l2_draw_angle, l2_oar, l2_speed_for_draw)
 
         # 9. HUD
         # Timer
@@ -1776,17 +2415,12 @@ while running:
     # ============================================================
     # LEVEL 1 PLAYING STATE
     # ============================================================
-    input_this_frame = False
-
     # Timer countdown
     timer_seconds -= dt
     if timer_seconds <= 0:
         timer_seconds = 60
-        boat_pos = INITIAL_BOAT_POS.copy()
-        boat_velocity = pygame.Vector2(0, 0)
-        boat_angle = 0
-        rotating = False
-        input_buffer = 0
+        l1_boat.reset(INITIAL_BOAT_POS)
+        l1_controls.buffer = 0
 
     # Update crash and shake
     l1_crash.update(dt)
@@ -1819,142 +2453,68 @@ while running:
                         fade.start(go_menu_from_l1)
                     continue
                 if event.key == pygame.K_LEFT:
-                    if not left_pressed:
-                        left_pressed = True
+                    if not l1_controls.left:
+                        l1_controls.left = True
                         oar_anim.trigger_left()
                         play_paddle_sound()
-                        if not rotating:
-                            rotation_start_angle = boat_angle
-                            rotation_direction = 1
-                            target_angle = (rotation_start_angle + ROTATION_STEP) % 360
-                            rotating = True
-                        else:
-                            if rotation_direction == -1:
-                                target_angle = rotation_start_angle % 360
-                                rotation_direction = 0
-                    input_buffer += 1
-                    last_input_time = current_time
-                    input_this_frame = True
+                        l1_boat.start_turn(1)
+                    l1_controls.press()
 
                 if event.key == pygame.K_RIGHT:
-                    if not right_pressed:
-                        right_pressed = True
+                    if not l1_controls.right:
+                        l1_controls.right = True
                         oar_anim.trigger_right()
                         play_paddle_sound()
-                        if not rotating:
-                            rotation_start_angle = boat_angle
-                            rotation_direction = -1
-                            target_angle = (rotation_start_angle - ROTATION_STEP) % 360
-                            rotating = True
-                        else:
-                            if rotation_direction == 1:
-                                target_angle = rotation_start_angle % 360
-                                rotation_direction = 0
-                    input_buffer += 1
-                    last_input_time = current_time
-                    input_this_frame = True
+                        l1_boat.start_turn(-1)
+                    l1_controls.press()
 
                 if event.key == pygame.K_DOWN:
-                    if not down_pressed:
-                        down_pressed = True
+                    if not l1_controls.down:
+                        l1_controls.down = True
                         oar_anim.trigger_left()
                         oar_anim.trigger_right()
                         play_paddle_sound()
-                        if not rotating:
-                            rotation_start_angle = boat_angle
-                            rotation_direction = 1
-                            target_angle = (rotation_start_angle + ROTATION_STEP) % 360
-                            rotating = True
-                        else:
-                            if rotation_direction == -1:
-                                target_angle = rotation_start_angle % 360
-                                rotation_direction = 0
-                    last_input_time = current_time
-                    input_this_frame = True
+                        l1_boat.start_turn(1)
+                    l1_controls.press(0)
 
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_LEFT:
-                    left_pressed = False
+                    l1_controls.left = False
                 if event.key == pygame.K_RIGHT:
-                    right_pressed = False
+                    l1_controls.right = False
                 if event.key == pygame.K_DOWN:
-                    down_pressed = False
-
-        if not input_this_frame:
-            if current_time - last_input_time > input_decay_time:
-                input_buffer = 0
-            else:
-                input_buffer *= math.exp(-dt / input_decay_time)
-
-        # ---- SMOOTH ROTATION ----
-        if rotating:
-            diff = (target_angle - boat_angle + 180) % 360 - 180
-            max_step = ROTATION_SPEED * dt
-            step = math.copysign(min(abs(diff), max_step), diff)
-            boat_angle += step
-            remaining = (target_angle - boat_angle + 180) % 360 - 180
-            if abs(remaining) < 0.01:
-                boat_angle = target_angle % 360
-                rotating = False
-                rotation_direction = 0
-        boat_angle %= 360
-
-        # ---- PHYSICS ----
-        forward_direction = pygame.Vector2(0, -1).rotate(boat_angle)
-
-        if input_buffer > 0.01:
-            total_accel = BASE_ACCEL + ACCEL_PER_PRESS * input_buffer
-            if left_pressed != right_pressed:
-                total_accel *= SINGLE_KEY_ACCEL_MULT
-            boat_velocity += forward_direction * total_accel * dt
-
-        speed = boat_velocity.length()
-        if speed > MAX_SPEED:
-            boat_velocity = (boat_velocity / speed) * MAX_SPEED
-
-        if speed > 0.01:
-            velocity_direction = boat_velocity.normalize()
-            alignment = velocity_direction.dot(forward_direction)
-            sideways_factor = abs(alignment)
-            sideways_effect_multiplier = SIDEWAYS_DRIFT_MULT
-            if left_pressed != right_pressed:
-                sideways_effect_multiplier *= SINGLE_KEY_SIDEWAYS_MULT
-            friction_multiplier = (
-                BASE_FRICTION
-                + (1 - sideways_factor)
-                * (SIDEWAYS_FRICTION - BASE_FRICTION)
-                * sideways_effect_multiplier
+                    l1_controls.down = False
+
+        # ---- PHYSICS (fixed ticks, see boat_physics) ----
+        for _ in range(l1_physics.ticks(dt)):
+            move = boat_physics.step(l1_boat, l1_controls, PHYSICS_DT)
+            # The river carries the boat along on top of its own move
+            if RIVER_CURRENT:
+                current_x, current_y = l1_flow.sample(l1_boat.pos.x, l1_boat.pos.y)
+                move.x += current_x * RIVER_CURRENT * PHYSICS_DT
+                move.y += current_y * RIVER_CURRENT * PHYSICS_DT
+
+            # Swept move: stop where the hull first touches the forest instead
+            # of tunneling through it on a long step
+            l1_hit = l1_collider.sweep(
+                l1_boat.pos.x, l1_boat.pos.y, move.x, move.y, l1_boat.angle
             )
-            boat_velocity *= friction_multiplier
-        else:
-            boat_velocity = pygame.Vector2(0, 0)
-
-        boat_pos += boat_velocity
-
-        # ---- COLLISION DETECTION ----
-        for cube_x, cube_y, cube_w, cube_h in cubes:
-            if (
-                boat_pos.x - boat_collision_radius < cube_x + cube_w
-                and boat_pos.x + boat_collision_radius > cube_x
-                and boat_pos.y - boat_collision_radius < cube_y + cube_h
-                and boat_pos.y + boat_collision_radius > cube_y
-            ):
-                if not l1_crash.active:
-                    l1_shake.trigger(6, 0.5)
-                    play_sound(crash_sfx)
-                    def l1_respawn():
-                        global boat_pos, boat_velocity, boat_angle, rotating
-                        boat_pos = INITIAL_BOAT_POS.copy()
-                        boat_velocity = pygame.Vector2(0, 0)
-                        boat_angle = 0
-                        rotating = False
-                        wake.clear()
-                    l1_crash.trigger(boat_pos, boat_angle, l1_respawn)
-                    boat_velocity = pygame.Vector2(0, 0)
+            l1_boat.pos += move * (l1_hit[0] if l1_hit is not None else 1)
+
+            # ---- COLLISION DETECTION ----
+            if l1_hit is not None:
+                l1_shake.trigger(6, 0.5)
+                play_sound(crash_sfx)
+                def l1_respawn():
+                    l1_boat.reset(INITIAL_BOAT_POS)
+                    wake.clear()
+                l1_crash.trigger(l1_boat.pos, l1_boat.angle, l1_respawn)
+                l1_boat.vel = pygame.Vector2(0, 0)
+                l1_boat.prev_pos = l1_boat.pos.copy()
                 break
 
         # ---- WIN CONDITION ----
-        if boat_pos.y < 40 and not l1_crash.active:
+        if l1_boat.pos.y < 40 and not l1_crash.active:
             if not fade.active:
                 def go_level1_complete():
                     global game_state, l1_complete_timer
@@ -1964,13 +2524,16 @@ while running:
 
     # ---- UPDATE ANIMATIONS ----
     oar_anim.update(dt)
-    wake.update(dt, boat_pos, boat_angle, boat_velocity.length())
+    l1_draw_pos, l1_draw_angle = l1_boat.interpolated(l1_physics.alpha)
+    wake.update(dt, l1_draw_pos, l1_draw_angle, l1_boat.vel.length())
+    l1_fish.update(dt)
 
     # ---- DRAWING (to frame buffer for shake) ----
     frame = l1_frame
 
-    # 1. Animated water background
-    water.draw(frame, dt, game_time)
+    # 1. Animated water background (only where the forest leaves it visible)
+    water.draw(frame, dt, game_time, mask=l1_river_mask)
+    l1_fish.draw(frame)
 
     # 2. Exit glow indicator at finish gap (top of screen, between obstacles)
     # The gap is between left wall (0-200) and obstacle at (330,0,720,230),
@@ -1981,13 +2544,12 @@ while running:
     glow_surf = pygame.Surface((130, 12), pygame.SRCALPHA)
     glow_surf.fill((80, 255, 120, glow_alpha))
     frame.blit(glow_surf, (200, 0))
-    pygame.draw.line(frame, (80, 255, 120), (200, 6), (330, 6), 2)
 
     # 3. Shoreline foam (before forest so it's partly hidden at edges)
     draw_foam(frame, foam_points, game_time)
 
-    # 4. Pre-rendered forest overlay
-    frame.blit(forest_surface, (0, 0))
+    # 4. Pre-rendered forest overlay and finish line (one static layer)
+    l1_static.draw(frame)
 
     # 5. Wake trail
     wake.draw(frame)
@@ -1997,7 +2559,7 @@ while running:
 
     # 7. Boat with animated oars (hide during crash)
     if not l1_crash.active:
-        draw_boat(frame, boat_pos, boat_angle, oar_anim, boat_velocity.length())
+        draw_boat(frame, l1_draw_pos, l1_draw_angle, oar_anim, l1_boat.vel.length())
 
     # 8. Timer display with drop shadow
     timer_color = (255, 0, 0) if timer_seconds <= 10 else (255, 255, 255)
@@ -2028,5 +2590,7 @@ while running:
     fade.draw(screen)
     pygame.display.flip()
 
+if layer_pool is not None:
+    layer_pool.shutdown()
 pygame.quit()
 sys.exit()